@@ -1167,10 +1167,12 @@ class ADKAgent:
         # Multi-instance: hydrate in-memory session cache from DB on startup/switch.
         # Ensures pending tool calls are detected across load-balanced instances
         # so user messages are not dispatched before tool results (prevents LLM errors).
+        # app_name/user_id are resolved once per run: the extractors may be
+        # user-supplied callables, so avoid invoking them repeatedly.
         user_id = self._get_user_id(input)
+        app_name = self._get_app_name(input)
         cache_key = (input.thread_id, user_id)
         if cache_key not in self._session_lookup_cache:
-            app_name = self._get_app_name(input)
             session = await self._session_manager._find_session_by_thread_id(
                 app_name, user_id, input.thread_id
             )
@@ -1197,11 +1199,9 @@ class ADKAgent:
 
         index = 0
         total_unseen = len(unseen_messages)
-        app_name = self._get_app_name(input)
         skip_tool_message_batch = False
 
         # Check if there are pending tool calls AND tool results in unseen messages
-        user_id = self._get_user_id(input)
         has_pending_tools = await self._has_pending_tool_calls(input.thread_id, user_id)
         has_tool_results_in_unseen = any(getattr(msg, "role", None) == "tool" for msg in unseen_messages)
 
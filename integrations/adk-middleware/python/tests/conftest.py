@@ -13,6 +13,9 @@ import pytest
 
 from ag_ui.core import SystemMessage as CoreSystemMessage
 
+# Importing the middleware at conftest load also pulls in google.adk (agents,
+# runners, sessions, apps) and google.genai.types, so that one-time import cost
+# lands in collection rather than in whichever test happens to run first.
 import ag_ui_adk.adk_agent as adk_agent_module
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,185 @@
+"""Lightweight stand-ins and helpers for ADKAgent.run() unit tests.
+
+Plain slotted dataclasses are far cheaper to build than MagicMock trees, and
+only expose the attributes the middleware actually reads. A MagicMock also
+answers every attribute with a truthy mock (e.g. ``part.thought``), which can
+silently steer the middleware down the wrong branch.
+"""
+
+import itertools
+import secrets
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ag_ui_adk import ADKAgent
+from ag_ui_adk.session_manager import INVOCATION_ID_STATE_KEY
+
+# Thread, run and function-call IDs only need to be unique within a test
+# session. A per-process random prefix keeps xdist workers apart; after that a
+# counter is enough, with no os.urandom call per ID.
+_ID_PREFIX = secrets.token_hex(4)
+_ID_COUNTER = itertools.count()
+
+
+def short_id() -> str:
+    """Return a process-unique 16-hex-digit ID."""
+    return f"{_ID_PREFIX}{next(_ID_COUNTER):08x}"
+
+
+@dataclass(slots=True)
+class FakeFunctionCall:
+    name: str
+    id: str
+    args: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class FakePart:
+    text: Optional[str] = None
+    function_call: Optional[FakeFunctionCall] = None
+    function_response: Any = None
+    thought: Optional[bool] = None
+
+
+@dataclass(slots=True)
+class FakeContent:
+    parts: List[FakePart]
+
+
+@dataclass(slots=True)
+class FakeEvent:
+    author: str
+    partial: bool
+    invocation_id: str
+    content: FakeContent
+    long_running_tool_ids: List[str] = field(default_factory=list)
+    actions: Any = None
+    custom_data: Any = None
+    finish_reason: Any = None
+
+    @property
+    def turn_complete(self) -> bool:
+        return not self.partial
+
+    def is_final_response(self) -> bool:
+        return not self.partial
+
+    def get_function_calls(self) -> list:
+        return []
+
+    def get_function_responses(self) -> list:
+        return []
+
+
+# Arguments of the fake LRO function call. Never mutated, so every event shares it.
+LRO_ARGS = {"plan": {"topic": "test"}}
+
+
+def make_fake_event(
+    *,
+    author: str = "test_agent",
+    text: str = "Hello",
+    partial: bool = False,
+    invocation_id: str = "inv_123",
+    has_lro: bool = False,
+    lro_tool_name: str = "approve_plan",
+) -> FakeEvent:
+    """Create a fake ADK event with sensible defaults.
+
+    Only the fields that vary between events are set here; everything else
+    comes from the FakeEvent/FakePart defaults.
+    """
+    parts = [FakePart(text=text)]
+    if not has_lro:
+        return FakeEvent(
+            author=author,
+            partial=partial,
+            invocation_id=invocation_id,
+            content=FakeContent(parts=parts),
+        )
+
+    fc = FakeFunctionCall(
+        name=lro_tool_name,
+        id=f"fc_{short_id()}",
+        args=LRO_ARGS,
+    )
+    parts.append(FakePart(function_call=fc))
+    return FakeEvent(
+        author=author,
+        partial=partial,
+        invocation_id=invocation_id,
+        content=FakeContent(parts=parts),
+        long_running_tool_ids=[fc.id],
+    )
+
+
+def invocation_id_snapshot(state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Record only what the assertions read from an update_session_state call."""
+    state = state or {}
+    return {
+        "has_inv": INVOCATION_ID_STATE_KEY in state,
+        "inv_value": state.get(INVOCATION_ID_STATE_KEY),
+    }
+
+
+async def drain(agen: AsyncIterator[Any]) -> None:
+    """Run an async generator to completion without keeping its items.
+
+    For tests that assert on what the fakes received, not on the emitted
+    AG-UI events.
+    """
+    async for _ in agen:
+        pass
+
+
+class FakeRunner:
+    """Stand-in for the ADK Runner returned by ADKAgent._create_runner.
+
+    run() only calls run_async() and close(), so a plain object with those two
+    is enough and avoids AsyncMock's call recording on every access.
+    """
+
+    __slots__ = ("run_async",)
+
+    def __init__(self, run_async: Callable[..., AsyncIterator[Any]]):
+        self.run_async = run_async
+
+    async def close(self) -> None:
+        pass
+
+
+@contextmanager
+def patched_agent(
+    adk_agent: ADKAgent,
+    *,
+    run_async: Callable[..., AsyncIterator[Any]],
+    update_state: Optional[Callable[..., Awaitable[bool]]] = None,
+    stored_state: Optional[Dict[str, Any]] = None,
+) -> Iterator[FakeRunner]:
+    """Stub out the runner and session-state calls adk_agent.run() makes.
+
+    update_state replaces SessionManager.update_session_state (a bare
+    AsyncMock when omitted); stored_state, when given, is what
+    get_session_state reports for the thread. Yields the fake runner.
+    """
+    session_manager = adk_agent._session_manager
+    runner = FakeRunner(run_async)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            session_manager,
+            "update_session_state",
+            update_state or AsyncMock(return_value=True),
+        )
+        if stored_state is not None:
+
+            async def get_state(session_id, app_name, user_id):
+                return dict(stored_state)
+
+            mp.setattr(session_manager, "get_session_state", get_state)
+        mp.setattr(adk_agent, "_create_runner", lambda *args, **kwargs: runner)
+        yield runner
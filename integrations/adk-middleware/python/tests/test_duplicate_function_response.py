@@ -11,21 +11,25 @@ AND passed the same function_response_content as new_message to ADK's
 runner.run_async(). ADK then also persisted the new_message internally,
 resulting in duplicate function_response events with different invocation_ids.
 
-The fix keeps the explicit append_event() (required for HITL resumption to work
-because InMemorySessionService.get_session() returns a deep copy and ADK's state
-checks happen before its internal persistence), but sets new_message = None to
-prevent the runner from appending a duplicate.
+The fix makes exactly one side persist the function_response. Without a
+trailing user message it is handed to runner.run_async() as new_message and
+ag-ui-adk appends nothing itself, so the runner's copy is the only one. With a
+trailing user message, that message is new_message and ag-ui-adk explicitly
+appends the function_response via append_event().
 """
 
 import pytest
 import asyncio
 import time
-from unittest.mock import patch, AsyncMock
+from operator import attrgetter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from unittest.mock import patch
 
 from ag_ui.core import (
     RunAgentInput, Tool as AGUITool,
     UserMessage, ToolMessage, AssistantMessage, ToolCall, FunctionCall,
 )
+from google.adk.agents import LlmAgent
 from google.adk.sessions.session import Event
 from google.genai import types
 
@@ -34,13 +38,140 @@ from ag_ui_adk.session_manager import SessionManager
 from tests.constants import LIVE_TEST_MODEL
 
 
+def _make_function_call_content(
+    tool_call_id: str, tool_name: str, args: Dict[str, Any]
+) -> types.Content:
+    """Build the model Content carrying a single FunctionCall part."""
+    return types.Content(
+        parts=[
+            types.Part(
+                function_call=types.FunctionCall(
+                    id=tool_call_id,
+                    name=tool_name,
+                    args=args
+                )
+            )
+        ],
+        role="model"
+    )
+
+
+# Every types.Part defines function_response (None when unset), so the scan
+# can read it directly instead of probing with hasattr/getattr.
+_get_function_response = attrgetter('function_response')
+
+
+class _FunctionResponseMatch(NamedTuple):
+    """A function_response part found in a session, with its owning event."""
+
+    event: Event
+    invocation_id: Optional[str]
+    function_response: types.FunctionResponse
+
+
+# Static parts of the single frontend-tool input; per-test fields are filled
+# in by _create_tool_input via model_copy.
+_TOOL_INPUT_TEMPLATE = RunAgentInput(
+    thread_id="template_thread",
+    run_id="template_run",
+    messages=[],
+    tools=[
+        AGUITool(
+            name="frontend_action",
+            description="A frontend action",
+            parameters={
+                "type": "object",
+                "properties": {"action": {"type": "string"}}
+            }
+        )
+    ],
+    context=[],
+    state={},
+    forwarded_props={}
+)
+
+
+def _create_tool_input(
+    thread_id: str,
+    run_id: str,
+    tool_call_id: str,
+    include_trailing_user_message: bool,
+) -> Tuple[RunAgentInput, List[Dict[str, Any]]]:
+    """Create a frontend_action tool-result input from the shared template.
+
+    Returns (input, tool_results), where tool_results is the list passed to
+    ``_run_adk_in_background`` for the input's ToolMessage.
+    """
+    tool_message = ToolMessage(
+        id="tool_result_1",
+        role="tool",
+        content='{"status": "completed"}',
+        tool_call_id=tool_call_id
+    )
+    messages = [
+        UserMessage(id="user_1", role="user", content="Do something"),
+        AssistantMessage(
+            id="assistant_1",
+            role="assistant",
+            content=None,
+            tool_calls=[
+                ToolCall(
+                    id=tool_call_id,
+                    function=FunctionCall(
+                        name="frontend_action",
+                        arguments='{"action": "render"}'
+                    )
+                )
+            ]
+        ),
+        tool_message,
+    ]
+    if include_trailing_user_message:
+        messages.append(
+            UserMessage(id="user_2", role="user", content="Thanks, continue!")
+        )
+    input_data = _TOOL_INPUT_TEMPLATE.model_copy(
+        update={"thread_id": thread_id, "run_id": run_id, "messages": messages}
+    )
+    tool_results = [{'tool_name': 'frontend_action', 'message': tool_message}]
+    return input_data, tool_results
+
+
+class _DiscardQueue:
+    """Event sink for runs whose emitted events are never consumed.
+
+    Implements the subset of asyncio.Queue that _run_adk_in_background uses.
+    """
+
+    async def put(self, item) -> None:
+        pass
+
+    def qsize(self) -> int:
+        return 0
+
+
+class _MockRunner:
+    """Runner stub that records run_async kwargs and yields no events."""
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    async def run_async(self, **kwargs):
+        self.calls.append(kwargs)
+        return
+        yield
+
+
 class TestDuplicateFunctionResponseFix:
     """Test cases for the duplicate function_response event bug fix."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_adk_agent(self):
-        """Create a mock ADK agent."""
-        from google.adk.agents import LlmAgent
+        """Create a mock ADK agent.
+
+        The LlmAgent is immutable config, so it is built once per module and
+        shared by every test.
+        """
         return LlmAgent(
             name="test_agent",
             model=LIVE_TEST_MODEL,
@@ -49,7 +180,11 @@ class TestDuplicateFunctionResponseFix:
 
     @pytest.fixture
     def ag_ui_adk(self, mock_adk_agent):
-        """Create ADK middleware with mocked dependencies."""
+        """Create ADK middleware with mocked dependencies.
+
+        Stays function-scoped: ADKAgent holds the SessionManager and the
+        session lookup caches, which must not leak between tests.
+        """
         SessionManager.reset_instance()
         agent = ADKAgent(
             adk_agent=mock_adk_agent,
@@ -88,17 +223,8 @@ class TestDuplicateFunctionResponseFix:
         )
 
         # Add the FunctionCall event to the session (simulating ADK behavior)
-        function_call_content = types.Content(
-            parts=[
-                types.Part(
-                    function_call=types.FunctionCall(
-                        id=tool_call_id,
-                        name=tool_name,
-                        args=tool_args
-                    )
-                )
-            ],
-            role="model"
+        function_call_content = _make_function_call_content(
+            tool_call_id, tool_name, tool_args
         )
         function_call_event = Event(
             timestamp=time.time(),
@@ -111,123 +237,16 @@ class TestDuplicateFunctionResponseFix:
 
         return app_name, backend_session_id
 
-    def _count_function_responses_in_session(self, session, tool_call_id: str) -> int:
-        """Count the number of function_response events for a specific tool_call_id."""
-        count = 0
-        for event in session.events:
-            if event.content and hasattr(event.content, 'parts'):
-                for part in event.content.parts:
-                    if hasattr(part, 'function_response') and part.function_response:
-                        fr = part.function_response
-                        if hasattr(fr, 'id') and fr.id == tool_call_id:
-                            count += 1
-        return count
-
-    @pytest.mark.asyncio
-    async def test_no_duplicate_function_response_without_user_message(self, ag_ui_adk):
-        """Test that only ONE function_response is persisted when tool result arrives alone.
-
-        This is the main regression test for the duplicate function_response bug.
-
-        Scenario:
-        1. Agent calls a LongRunningFunctionTool (e.g., useFrontendTool)
-        2. Client submits tool result WITHOUT any additional user message
-        3. Only ONE function_response event should be persisted to the session
+    async def _run_with_mock_runner(
+        self, ag_ui_adk, input_data, app_name, tool_results, message_batch
+    ) -> Dict[str, Any]:
+        """Run the background execution against a _MockRunner.
 
-        Before fix: 2 function_response events (one from explicit append_event,
-                    one from ADK's runner processing new_message)
-        After fix:  1 function_response event (from explicit append_event only,
-                    new_message is set to None so runner doesn't duplicate)
+        Returns the kwargs the runner's run_async was called with.
         """
-        thread_id = "test_no_duplicate_without_user"
-        tool_call_id = "lro_tool_call_123"
-        run_id = "run_no_duplicate"
-
-        # Set up input with tool result ONLY (no trailing user message)
-        input_data = RunAgentInput(
-            thread_id=thread_id,
-            run_id=run_id,
-            messages=[
-                UserMessage(id="user_1", role="user", content="Do something"),
-                AssistantMessage(
-                    id="assistant_1",
-                    role="assistant",
-                    content=None,
-                    tool_calls=[
-                        ToolCall(
-                            id=tool_call_id,
-                            function=FunctionCall(
-                                name="frontend_action",
-                                arguments='{"action": "render"}'
-                            )
-                        )
-                    ]
-                ),
-                ToolMessage(
-                    id="tool_result_1",
-                    role="tool",
-                    content='{"status": "completed"}',
-                    tool_call_id=tool_call_id
-                )
-                # NOTE: No trailing user message - this is the bug scenario
-            ],
-            tools=[
-                AGUITool(
-                    name="frontend_action",
-                    description="A frontend action",
-                    parameters={
-                        "type": "object",
-                        "properties": {"action": {"type": "string"}}
-                    }
-                )
-            ],
-            context=[],
-            state={},
-            forwarded_props={}
-        )
-
-        # Mark initial messages as processed
-        ag_ui_adk._session_manager.mark_messages_processed(
-            "test_app", thread_id, ["user_1", "assistant_1"]
-        )
-
-        # Set up session with pending tool call
-        app_name, backend_session_id = await self._setup_session_with_tool_call(
-            ag_ui_adk, thread_id, tool_call_id, "frontend_action", {"action": "render"}
-        )
-
-        # Mock the runner to avoid actual LLM calls
-        # This verifies we pass the correct parameters to prevent duplicates
-        class MockRunner:
-            async def run_async(self, **kwargs):
-                # Regression fix: verify BOTH new_message and invocation_id are provided
-                new_msg = kwargs.get('new_message')
-                inv_id = kwargs.get('invocation_id')
-
-                # Should pass new_message with function_response content
-                assert new_msg is not None, (
-                    "new_message should contain function_response (regression fix approach)"
-                )
-                assert hasattr(new_msg, 'parts'), "new_message should have parts"
-                assert len(new_msg.parts) > 0, "new_message should have at least one part"
-
-                # Should specify invocation_id to prevent ADK auto-generation
-                assert inv_id is not None, (
-                    "invocation_id should be provided to use client's run_id"
-                )
-                return
-                yield
-
-        # Prepare tool results (no message_batch since no trailing user message)
-        tool_results = [
-            {
-                'tool_name': 'frontend_action',
-                'message': input_data.messages[2]
-            }
-        ]
-
-        with patch.object(ag_ui_adk, '_create_runner', return_value=MockRunner()):
-            event_queue = asyncio.Queue()
+        runner = _MockRunner()
+        with patch.object(ag_ui_adk, '_create_runner', return_value=runner):
+            event_queue = _DiscardQueue()
 
             await ag_ui_adk._run_adk_in_background(
                 input=input_data,
@@ -237,69 +256,100 @@ class TestDuplicateFunctionResponseFix:
                 event_queue=event_queue,
                 client_proxy_toolsets=[],
                 tool_results=tool_results,
-                message_batch=None  # No trailing user message
+                message_batch=message_batch
             )
 
-        # Note: With the regression fix approach, we pass new_message + invocation_id to ADK.
-        # The MockRunner above validates these parameters are correct.
-        # Integration tests with real ADK runners (test_lro_tool_response_persistence.py)
-        # validate that only 1 function_response event is persisted with the correct invocation_id.
+        assert len(runner.calls) == 1, "runner.run_async should be called exactly once"
+        return runner.calls[0]
+
+    async def _get_final_session(self, ag_ui_adk, app_name: str, backend_session_id: str):
+        """Read the session back after a run.
+
+        The session returned during setup can't be reused here: get_session on
+        InMemorySessionService hands out deep copies, so only a fresh read sees
+        the events persisted during the run.
+        """
+        return await ag_ui_adk._session_manager._session_service.get_session(
+            session_id=backend_session_id,
+            app_name=app_name,
+            user_id="test_user"
+        )
+
+    def _iter_function_responses(self, session):
+        """Yield (event, function_response) for every function_response part."""
+        for event in session.events:
+            parts = getattr(event.content, 'parts', None)
+            if not parts:
+                continue
+            for fr in map(_get_function_response, parts):
+                if fr is None or fr.id is None:
+                    continue
+                yield event, fr
+
+    def _index_function_responses(self, session) -> Dict[str, List[_FunctionResponseMatch]]:
+        """Index a session's function_response parts by tool_call_id in one pass."""
+        index: Dict[str, List[_FunctionResponseMatch]] = {}
+        for event, fr in self._iter_function_responses(session):
+            index.setdefault(fr.id, []).append(
+                _FunctionResponseMatch(event, event.invocation_id, fr)
+            )
+        return index
+
+    def _count_function_responses(
+        self, session, tool_call_id: str, limit: Optional[int] = 2
+    ) -> Tuple[int, List[_FunctionResponseMatch]]:
+        """Count function_response events for a specific tool_call_id.
+
+        The scan stops once ``limit`` matches are found (``None`` scans the
+        whole session). The default of 2 is enough to tell "exactly one" from
+        a duplicate.
+
+        Returns (count, list of matches).
+        """
+        responses: List[_FunctionResponseMatch] = []
+        for event, fr in self._iter_function_responses(session):
+            if fr.id != tool_call_id:
+                continue
+            responses.append(_FunctionResponseMatch(event, event.invocation_id, fr))
+            if limit is not None and len(responses) >= limit:
+                break
+        return len(responses), responses
 
     @pytest.mark.asyncio
-    async def test_function_response_persisted_with_user_message(self, ag_ui_adk):
-        """Test that function_response IS persisted when tool result has trailing user message.
+    @pytest.mark.parametrize(
+        "include_trailing_user_message, expected_persisted",
+        [
+            pytest.param(False, 0, id="tool_result_only"),
+            pytest.param(True, 1, id="with_trailing_user_message"),
+        ],
+    )
+    async def test_tool_result_persists_single_function_response(
+        self, ag_ui_adk, include_trailing_user_message, expected_persisted
+    ):
+        """Test that a single tool result never yields duplicate function_response events.
+
+        This is the main regression test for the duplicate function_response bug.
+
+        Scenario:
+        1. Agent calls a LongRunningFunctionTool (e.g., useFrontendTool)
+        2. Client submits the tool result, with or without a trailing user message
 
-        When tool results arrive WITH a trailing user message, ag-ui-adk needs to
-        explicitly persist the function_response because ADK will receive the user
-        message as new_message, not the function_response.
+        Without a trailing user message (the bug scenario), the function_response
+        is handed to the runner as new_message and ag-ui-adk must not persist its
+        own copy; the runner owns persistence. Before the fix both happened,
+        producing 2 function_response events.
 
-        This test ensures the fix didn't break this case.
+        With a trailing user message, ag-ui-adk explicitly persists the
+        function_response because ADK receives the user message as new_message,
+        not the function_response. This ensures the fix didn't break this case.
         """
-        thread_id = "test_persist_with_user"
-        tool_call_id = "lro_tool_call_456"
-        run_id = "run_with_user_message"
+        suffix = "with_user" if include_trailing_user_message else "no_user"
+        thread_id = f"test_single_tool_{suffix}"
+        tool_call_id = f"lro_tool_call_{suffix}"
+        run_id = f"run_single_tool_{suffix}"
 
-        # Set up input with tool result AND trailing user message
-        input_data = RunAgentInput(
-            thread_id=thread_id,
-            run_id=run_id,
-            messages=[
-                UserMessage(id="user_1", role="user", content="Do something"),
-                AssistantMessage(
-                    id="assistant_1",
-                    role="assistant",
-                    content=None,
-                    tool_calls=[
-                        ToolCall(
-                            id=tool_call_id,
-                            function=FunctionCall(
-                                name="frontend_action",
-                                arguments='{"action": "render"}'
-                            )
-                        )
-                    ]
-                ),
-                ToolMessage(
-                    id="tool_result_1",
-                    role="tool",
-                    content='{"status": "completed"}',
-                    tool_call_id=tool_call_id
-                ),
-                UserMessage(id="user_2", role="user", content="Thanks, continue!")
-            ],
-            tools=[
-                AGUITool(
-                    name="frontend_action",
-                    description="A frontend action",
-                    parameters={
-                        "type": "object",
-                        "properties": {"action": {"type": "string"}}
-                    }
-                )
-            ],
-            context=[],
-            state={},
-            forwarded_props={}
+        input_data, tool_results = _create_tool_input(
+            thread_id, run_id, tool_call_id, include_trailing_user_message
         )
 
         # Mark initial messages as processed
@@ -312,63 +362,56 @@ class TestDuplicateFunctionResponseFix:
             ag_ui_adk, thread_id, tool_call_id, "frontend_action", {"action": "render"}
         )
 
-        # Mock the runner
-        class MockRunner:
-            async def run_async(self, **kwargs):
-                # With trailing user message, new_message should be the user message (not None)
-                new_msg = kwargs.get('new_message')
-                assert new_msg is not None, "new_message should be the user message"
-                return
-                yield
-
-        # Prepare tool results WITH message_batch (trailing user message)
-        tool_results = [
-            {
-                'tool_name': 'frontend_action',
-                'message': input_data.messages[2]
-            }
-        ]
-        message_batch = [input_data.messages[3]]  # Trailing user message
+        message_batch = (
+            [input_data.messages[3]] if include_trailing_user_message else None
+        )
 
-        with patch.object(ag_ui_adk, '_create_runner', return_value=MockRunner()):
-            event_queue = asyncio.Queue()
+        # Mock the runner to avoid actual LLM calls
+        run_kwargs = await self._run_with_mock_runner(
+            ag_ui_adk, input_data, app_name, tool_results, message_batch
+        )
 
-            await ag_ui_adk._run_adk_in_background(
-                input=input_data,
-                adk_agent=ag_ui_adk._adk_agent,
-                user_id="test_user",
-                app_name=app_name,
-                event_queue=event_queue,
-                client_proxy_toolsets=[],
-                tool_results=tool_results,
-                message_batch=message_batch  # Has trailing user message
-            )
+        new_msg = run_kwargs.get('new_message')
+        assert new_msg is not None, "new_message should always be provided"
+        assert hasattr(new_msg, 'parts'), "new_message should have parts"
+        assert len(new_msg.parts) > 0, "new_message should have at least one part"
+        carries_function_response = any(
+            part.function_response is not None for part in new_msg.parts
+        )
+        # Regression fix: without a user message, new_message carries the tool
+        # result; with one, new_message is the user message
+        assert carries_function_response is not include_trailing_user_message, (
+            "new_message should carry the function_response only when there is "
+            "no trailing user message"
+        )
 
-        # Verify: function_response should be explicitly persisted
-        session = await ag_ui_adk._session_manager._session_service.get_session(
-            session_id=backend_session_id,
-            app_name=app_name,
-            user_id="test_user"
+        # This agent is not resumable, so invocation_id is left to the runner
+        # (it is only passed through for resumable apps)
+        assert 'invocation_id' not in run_kwargs, (
+            "invocation_id should only be provided for resumable agents"
         )
 
-        function_response_count = self._count_function_responses_in_session(
+        session = await self._get_final_session(ag_ui_adk, app_name, backend_session_id)
+
+        function_response_count, _ = self._count_function_responses(
             session, tool_call_id
         )
-
-        # With trailing user message, we explicitly persist (ADK gets user msg as new_message)
-        assert function_response_count == 1, (
-            f"Expected exactly 1 function_response event when tool result has "
-            f"trailing user message, but found {function_response_count}. "
-            f"The function_response should be explicitly persisted in this case."
+        assert function_response_count == expected_persisted, (
+            f"Expected {expected_persisted} explicitly persisted function_response "
+            f"event(s), but found {function_response_count}."
         )
 
+        # Integration tests with real ADK runners (test_lro_tool_response_persistence.py)
+        # validate that only 1 function_response event is persisted with the correct invocation_id.
+
     @pytest.mark.asyncio
     async def test_multiple_tool_results_without_user_message(self, ag_ui_adk):
         """Test multiple tool results without trailing user message - exactly 1 event per tool.
 
-        When multiple tool results arrive without a user message, we should persist
-        exactly ONE function_response event per tool (all in a single Content with
-        multiple parts). The runner receives new_message = None, so no duplicates.
+        When multiple tool results arrive without a user message, the runner
+        receives them all as new_message (a single Content with one part per
+        tool) and ag-ui-adk persists none of them itself, so no tool ends up
+        with more than one function_response event.
         """
         thread_id = "test_multiple_tools_no_user"
         tool_call_id_1 = "lro_tool_call_multi_1"
@@ -448,7 +491,8 @@ class TestDuplicateFunctionResponseFix:
             initial_state={}
         )
 
-        # Add both tool calls as pending
+        # Add both tool calls as pending. These stay sequential: each call does a
+        # read-modify-write of the pending_tool_calls state list.
         await ag_ui_adk._add_pending_tool_call_with_context(
             thread_id, tool_call_id_1, app_name, "test_user"
         )
@@ -456,46 +500,26 @@ class TestDuplicateFunctionResponseFix:
             thread_id, tool_call_id_2, app_name, "test_user"
         )
 
-        # Add FunctionCall events for both
-        for tool_id, tool_name in [(tool_call_id_1, "action_one"), (tool_call_id_2, "action_two")]:
-            fc_content = types.Content(
-                parts=[
-                    types.Part(
-                        function_call=types.FunctionCall(
-                            id=tool_id,
-                            name=tool_name,
-                            args={}
-                        )
-                    )
-                ],
-                role="model"
-            )
-            fc_event = Event(timestamp=time.time(), author="test_agent", content=fc_content)
-            session = await ag_ui_adk._session_manager._session_service.get_session(
-                session_id=backend_session_id, app_name=app_name, user_id="test_user"
+        # Add FunctionCall events for both. The events are independent, so the
+        # appends are issued concurrently against the in-memory service.
+        # append_event accepts the session returned by _ensure_session_exists
+        # even though later state writes made it stale, so no re-fetch is needed.
+        session_service = ag_ui_adk._session_manager._session_service
+        function_calls = [
+            (tool_call_id_1, "action_one", {}),
+            (tool_call_id_2, "action_two", {}),
+        ]
+        fc_events = [
+            Event(
+                timestamp=time.time(),
+                author="test_agent",
+                content=_make_function_call_content(tool_id, tool_name, args),
             )
-            await ag_ui_adk._session_manager._session_service.append_event(session, fc_event)
-
-        # Mock the runner
-        class MockRunner:
-            async def run_async(self, **kwargs):
-                # Regression fix: verify BOTH new_message and invocation_id are provided
-                new_msg = kwargs.get('new_message')
-                inv_id = kwargs.get('invocation_id')
-
-                # Should pass new_message with function_response content (multiple parts)
-                assert new_msg is not None, (
-                    "new_message should contain function_response (regression fix approach)"
-                )
-                assert hasattr(new_msg, 'parts'), "new_message should have parts"
-                assert len(new_msg.parts) == 2, "new_message should have 2 parts (2 tool results)"
-
-                # Should specify invocation_id to prevent ADK auto-generation
-                assert inv_id is not None, (
-                    "invocation_id should be provided to use client's run_id"
-                )
-                return
-                yield
+            for tool_id, tool_name, args in function_calls
+        ]
+        await asyncio.gather(
+            *(session_service.append_event(session, fc_event) for fc_event in fc_events)
+        )
 
         # Prepare tool results
         tool_results = [
@@ -503,21 +527,37 @@ class TestDuplicateFunctionResponseFix:
             {'tool_name': 'action_two', 'message': input_data.messages[3]}
         ]
 
-        with patch.object(ag_ui_adk, '_create_runner', return_value=MockRunner()):
-            event_queue = asyncio.Queue()
+        run_kwargs = await self._run_with_mock_runner(
+            ag_ui_adk, input_data, app_name, tool_results,
+            message_batch=None  # No trailing user message
+        )
 
-            await ag_ui_adk._run_adk_in_background(
-                input=input_data,
-                adk_agent=ag_ui_adk._adk_agent,
-                user_id="test_user",
-                app_name=app_name,
-                event_queue=event_queue,
-                client_proxy_toolsets=[],
-                tool_results=tool_results,
-                message_batch=None  # No trailing user message
+        # Regression fix: verify new_message carries the tool result
+        new_msg = run_kwargs.get('new_message')
+
+        # Should pass new_message with function_response content (multiple parts)
+        assert new_msg is not None, (
+            "new_message should contain function_response (regression fix approach)"
+        )
+        assert hasattr(new_msg, 'parts'), "new_message should have parts"
+        assert len(new_msg.parts) == 2, "new_message should have 2 parts (2 tool results)"
+
+        # This agent is not resumable, so invocation_id is left to the runner
+        # (it is only passed through for resumable apps)
+        assert 'invocation_id' not in run_kwargs, (
+            "invocation_id should only be provided for resumable agents"
+        )
+
+        # Index the session once and look up both tool calls
+        session = await self._get_final_session(ag_ui_adk, app_name, backend_session_id)
+        responses_by_id = self._index_function_responses(session)
+        for tool_id in (tool_call_id_1, tool_call_id_2):
+            count = len(responses_by_id.get(tool_id, []))
+            assert count <= 1, (
+                f"Expected at most 1 function_response event for {tool_id}, found {count}"
             )
 
-        # Note: With the regression fix approach, we pass new_message + invocation_id to ADK.
-        # The MockRunner above validates these parameters are correct (including 2 parts).
+        # Note: With the regression fix approach, we pass new_message to ADK.
+        # The assertions above validate these parameters are correct (including 2 parts).
         # Integration tests with real ADK runners validate that function_response events
         # are persisted correctly without duplication.
@@ -15,9 +15,6 @@ Context:
 - This test ensures any fix for #1079 preserves SequentialAgent behavior
 """
 
-import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
-
 import pytest
 from ag_ui.core import (
     EventType,
@@ -31,56 +28,13 @@ from google.adk.apps import App, ResumabilityConfig
 from ag_ui_adk import ADKAgent
 from ag_ui_adk.session_manager import INVOCATION_ID_STATE_KEY, SessionManager
 from tests.constants import LIVE_TEST_MODEL
-
-
-def _make_mock_event(
-    *,
-    author="test_agent",
-    text="Hello",
-    partial=False,
-    invocation_id="inv_123",
-    has_lro=False,
-    lro_tool_name="approve_plan",
-    actions=None,
-):
-    """Create a mock ADK event with sensible defaults."""
-    event = MagicMock()
-    event.author = author
-    event.partial = partial
-    event.invocation_id = invocation_id
-    event.turn_complete = not partial
-    event.actions = actions
-
-    # Content with text part
-    text_part = MagicMock()
-    text_part.text = text
-    text_part.function_call = None
-    text_part.function_response = None
-
-    parts = [text_part]
-
-    if has_lro:
-        fc_part = MagicMock()
-        fc_part.text = None
-        fc = MagicMock()
-        fc.name = lro_tool_name
-        fc.id = f"fc_{uuid.uuid4().hex[:8]}"
-        fc.args = {"plan": {"topic": "test"}}
-        fc_part.function_call = fc
-        fc_part.function_response = None
-        parts.append(fc_part)
-        event.long_running_tool_ids = [fc.id]
-    else:
-        event.long_running_tool_ids = []
-
-    event.content = MagicMock()
-    event.content.parts = parts
-
-    event.is_final_response = MagicMock(return_value=not partial)
-    event.get_function_calls = MagicMock(return_value=[])
-    event.get_function_responses = MagicMock(return_value=[])
-
-    return event
+from tests.fake_events import (
+    drain,
+    invocation_id_snapshot,
+    make_fake_event,
+    patched_agent,
+    short_id,
+)
 
 
 class TestSequentialAgentHitlResumption:
@@ -100,7 +54,7 @@ class TestSequentialAgentHitlResumption:
         yield
         SessionManager.reset_instance()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sequential_agent(self):
         """Create a SequentialAgent with two LlmAgent sub-agents."""
         planner = LlmAgent(
@@ -118,17 +72,20 @@ class TestSequentialAgentHitlResumption:
             sub_agents=[planner, executor],
         )
 
-    @pytest.fixture
-    def resumable_sequential_adk_agent(self, sequential_agent):
-        """ADKAgent wrapping a SequentialAgent with ResumabilityConfig."""
-        app = App(
+    @pytest.fixture(scope="class")
+    def resumable_sequential_app(self, sequential_agent):
+        return App(
             name="test_seq_app",
             root_agent=sequential_agent,
             resumability_config=ResumabilityConfig(is_resumable=True),
         )
-        return ADKAgent.from_app(app, user_id="test_user")
 
     @pytest.fixture
+    def resumable_sequential_adk_agent(self, resumable_sequential_app):
+        """ADKAgent wrapping a SequentialAgent with ResumabilityConfig."""
+        return ADKAgent.from_app(resumable_sequential_app, user_id="test_user")
+
+    @pytest.fixture(scope="class")
     def hitl_tool(self):
         """A sample HITL tool for the planner sub-agent."""
         return AGUITool(
@@ -173,13 +130,13 @@ class TestSequentialAgentHitlResumption:
             run_async_kwargs_capture.update(kwargs)
             # Simulate a resumed run: planner_agent acknowledges the tool result,
             # then executor_agent runs
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="planner_agent",
                 text="Plan approved, proceeding.",
                 partial=False,
                 invocation_id="inv_from_lro_pause",
             )
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="executor_agent",
                 text="Executing the plan now.",
                 partial=False,
@@ -189,12 +146,9 @@ class TestSequentialAgentHitlResumption:
         # Simulate stored invocation_id from a previous LRO pause
         stored_inv_id = "inv_from_lro_pause"
 
-        async def mock_get_state(session_id, app_name, user_id):
-            return {INVOCATION_ID_STATE_KEY: stored_inv_id}
-
         input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
+            thread_id=f"test_{short_id()}",
+            run_id=f"run_{short_id()}",
             messages=[UserMessage(id="msg1", content="Hello")],
             state={},
             tools=[hitl_tool],
@@ -202,21 +156,12 @@ class TestSequentialAgentHitlResumption:
             forwarded_props={},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            new_callable=AsyncMock,
-        ), patch.object(
-            adk_agent._session_manager,
-            "get_session_state",
-            side_effect=mock_get_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent,
+            run_async=mock_run_async,
+            stored_state={INVOCATION_ID_STATE_KEY: stored_inv_id},
+        ):
+            await drain(adk_agent.run(input_data))
 
         # CRITICAL ASSERTION: invocation_id MUST be passed for SequentialAgent
         assert "invocation_id" in run_async_kwargs_capture, (
@@ -248,18 +193,18 @@ class TestSequentialAgentHitlResumption:
         update_calls = []
 
         async def tracking_update_state(session_id, app_name, user_id, state):
-            update_calls.append({"state": dict(state) if state else {}})
+            update_calls.append(invocation_id_snapshot(state))
             return True
 
         async def mock_run_async(**kwargs):
             # Simulate: planner_agent emits text, then an LRO tool call
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="planner_agent",
                 text="Let me create a plan for you.",
                 partial=True,
                 invocation_id="inv_initial_run",
             )
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="planner_agent",
                 text="",
                 partial=False,
@@ -269,8 +214,8 @@ class TestSequentialAgentHitlResumption:
             )
 
         input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
+            thread_id=f"test_{short_id()}",
+            run_id=f"run_{short_id()}",
             messages=[UserMessage(id="msg1", content="Plan a trip")],
             state={},
             tools=[hitl_tool],
@@ -278,23 +223,15 @@ class TestSequentialAgentHitlResumption:
             forwarded_props={},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent, run_async=mock_run_async, update_state=tracking_update_state
+        ):
+            await drain(adk_agent.run(input_data))
 
         # The invocation_id should have been stored for future HITL resumption
         invocation_store_calls = [
             c for c in update_calls
-            if INVOCATION_ID_STATE_KEY in c["state"]
-            and c["state"][INVOCATION_ID_STATE_KEY] is not None
+            if c["has_inv"] and c["inv_value"] is not None
         ]
         assert len(invocation_store_calls) >= 1, (
             "invocation_id was not stored during the LRO pause. "
@@ -318,17 +255,17 @@ class TestSequentialAgentHitlResumption:
         update_calls = []
 
         async def tracking_update_state(session_id, app_name, user_id, state):
-            update_calls.append({"state": dict(state) if state else {}})
+            update_calls.append(invocation_id_snapshot(state))
             return True
 
         async def mock_run_async(**kwargs):
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="planner_agent",
                 text="Creating plan...",
                 partial=True,
                 invocation_id="inv_lro_pause",
             )
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="planner_agent",
                 text="",
                 partial=False,
@@ -338,8 +275,8 @@ class TestSequentialAgentHitlResumption:
             )
 
         input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
+            thread_id=f"test_{short_id()}",
+            run_id=f"run_{short_id()}",
             messages=[UserMessage(id="msg1", content="Plan something")],
             state={},
             tools=[hitl_tool],
@@ -347,28 +284,19 @@ class TestSequentialAgentHitlResumption:
             forwarded_props={},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent, run_async=mock_run_async, update_state=tracking_update_state
+        ):
+            await drain(adk_agent.run(input_data))
 
         # Check that invocation_id was stored but NOT cleared (since LRO is active)
         store_calls = [
             c for c in update_calls
-            if INVOCATION_ID_STATE_KEY in c["state"]
-            and c["state"][INVOCATION_ID_STATE_KEY] is not None
+            if c["has_inv"] and c["inv_value"] is not None
         ]
         clear_calls = [
             c for c in update_calls
-            if INVOCATION_ID_STATE_KEY in c["state"]
-            and c["state"][INVOCATION_ID_STATE_KEY] is None
+            if c["has_inv"] and c["inv_value"] is None
         ]
 
         assert len(store_calls) >= 1, (
@@ -396,18 +324,18 @@ class TestSequentialAgentHitlResumption:
         update_calls = []
 
         async def tracking_update_state(session_id, app_name, user_id, state):
-            update_calls.append({"state": dict(state) if state else {}})
+            update_calls.append(invocation_id_snapshot(state))
             return True
 
         async def mock_run_async(**kwargs):
             # Normal run with no LRO — both sub-agents complete normally
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="planner_agent",
                 text="Here is the plan.",
                 partial=False,
                 invocation_id="inv_normal",
             )
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="executor_agent",
                 text="Plan executed.",
                 partial=False,
@@ -415,8 +343,8 @@ class TestSequentialAgentHitlResumption:
             )
 
         input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
+            thread_id=f"test_{short_id()}",
+            run_id=f"run_{short_id()}",
             messages=[UserMessage(id="msg1", content="Do something simple")],
             state={},
             tools=[],
@@ -424,23 +352,15 @@ class TestSequentialAgentHitlResumption:
             forwarded_props={},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent, run_async=mock_run_async, update_state=tracking_update_state
+        ):
+            await drain(adk_agent.run(input_data))
 
         # After a completed run (no LRO), invocation_id should be cleared
         clear_calls = [
             c for c in update_calls
-            if INVOCATION_ID_STATE_KEY in c["state"]
-            and c["state"][INVOCATION_ID_STATE_KEY] is None
+            if c["has_inv"] and c["inv_value"] is None
         ]
         # It's acceptable for there to be zero clear calls if the ID was never
         # stored in the first place (no prior stored_invocation_id). The key
@@ -462,7 +382,7 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
         yield
         SessionManager.reset_instance()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def llm_root_with_sequential_sub(self):
         """LlmAgent root with a SequentialAgent sub-agent."""
         step1 = LlmAgent(
@@ -486,16 +406,19 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
             sub_agents=[seq],
         )
 
-    @pytest.fixture
-    def resumable_adk_agent(self, llm_root_with_sequential_sub):
-        app = App(
+    @pytest.fixture(scope="class")
+    def resumable_app(self, llm_root_with_sequential_sub):
+        return App(
             name="test_llm_seq_app",
             root_agent=llm_root_with_sequential_sub,
             resumability_config=ResumabilityConfig(is_resumable=True),
         )
-        return ADKAgent.from_app(app, user_id="test_user")
 
     @pytest.fixture
+    def resumable_adk_agent(self, resumable_app):
+        return ADKAgent.from_app(resumable_app, user_id="test_user")
+
+    @pytest.fixture(scope="class")
     def hitl_tool(self):
         return AGUITool(
             name="approve_plan",
@@ -535,7 +458,7 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
 
         async def mock_run_async(**kwargs):
             run_async_kwargs_capture.update(kwargs)
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="step1_agent",
                 text="Requirements gathered.",
                 partial=False,
@@ -544,12 +467,9 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
 
         stored_inv_id = "inv_from_lro_pause"
 
-        async def mock_get_state(session_id, app_name, user_id):
-            return {INVOCATION_ID_STATE_KEY: stored_inv_id}
-
         input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
+            thread_id=f"test_{short_id()}",
+            run_id=f"run_{short_id()}",
             messages=[UserMessage(id="msg1", content="Hello")],
             state={},
             tools=[hitl_tool],
@@ -557,21 +477,12 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
             forwarded_props={},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            new_callable=AsyncMock,
-        ), patch.object(
-            adk_agent._session_manager,
-            "get_session_state",
-            side_effect=mock_get_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent,
+            run_async=mock_run_async,
+            stored_state={INVOCATION_ID_STATE_KEY: stored_inv_id},
+        ):
+            await drain(adk_agent.run(input_data))
 
         assert "invocation_id" in run_async_kwargs_capture, (
             "REGRESSION (issue #1444): run_async was NOT passed invocation_id "
@@ -590,17 +501,17 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
         update_calls = []
 
         async def tracking_update_state(session_id, app_name, user_id, state):
-            update_calls.append({"state": dict(state) if state else {}})
+            update_calls.append(invocation_id_snapshot(state))
             return True
 
         async def mock_run_async(**kwargs):
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="step1_agent",
                 text="Gathering requirements...",
                 partial=True,
                 invocation_id="inv_initial_run",
             )
-            yield _make_mock_event(
+            yield make_fake_event(
                 author="step1_agent",
                 text="",
                 partial=False,
@@ -610,8 +521,8 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
             )
 
         input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
+            thread_id=f"test_{short_id()}",
+            run_id=f"run_{short_id()}",
             messages=[UserMessage(id="msg1", content="Start pipeline")],
             state={},
             tools=[hitl_tool],
@@ -619,22 +530,14 @@ class TestLlmAgentWithSequentialSubAgentHitlResumption:
             forwarded_props={},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent, run_async=mock_run_async, update_state=tracking_update_state
+        ):
+            await drain(adk_agent.run(input_data))
 
         invocation_store_calls = [
             c for c in update_calls
-            if INVOCATION_ID_STATE_KEY in c["state"]
-            and c["state"][INVOCATION_ID_STATE_KEY] is not None
+            if c["has_inv"] and c["inv_value"] is not None
         ]
         assert len(invocation_store_calls) >= 1, (
             "invocation_id was not stored during LRO pause for "
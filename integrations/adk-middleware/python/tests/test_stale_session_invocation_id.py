@@ -11,9 +11,16 @@ can call populate_invocation_agent_states() to restore internal state.
 See test_sequential_agent_hitl_resumption.py for those tests.
 """
 
-import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
-
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+)
 import pytest
 from ag_ui.core import RunAgentInput
 from ag_ui.core import Tool as AGUITool
@@ -24,6 +31,74 @@ from google.adk.apps import App, ResumabilityConfig
 from ag_ui_adk import ADKAgent
 from ag_ui_adk.session_manager import INVOCATION_ID_STATE_KEY, SessionManager
 from tests.constants import LIVE_TEST_MODEL
+from tests.fake_events import (
+    FakeEvent,
+    drain,
+    invocation_id_snapshot,
+    make_fake_event,
+    patched_agent,
+    short_id,
+)
+
+_APPROVE_PLAN_TOOL = AGUITool.model_construct(
+    name="approve_plan",
+    description="Approve a plan",
+    parameters={"type": "object", "properties": {}},
+)
+
+
+def _make_input(
+    content: str = "Hello", tools: Sequence[AGUITool] = ()
+) -> RunAgentInput:
+    """Build a single-user-message RunAgentInput for a fresh thread.
+
+    The inputs are fixed literals authored here, so model_construct skips
+    Pydantic validation rather than re-checking them on every test.
+    """
+    return RunAgentInput.model_construct(
+        thread_id=f"test_{short_id()}",
+        run_id=f"run_{short_id()}",
+        messages=[UserMessage.model_construct(id="msg1", content=content)],
+        state={},
+        tools=list(tools),
+        context=[],
+        forwarded_props={},
+    )
+
+
+async def _replay_events(
+    events: Sequence[FakeEvent],
+    *,
+    capture: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> AsyncIterator[FakeEvent]:
+    """Stand-in for Runner.run_async that yields pre-built events.
+
+    When capture is given it receives the kwargs run_async was called with.
+    """
+    if capture is not None:
+        capture.update(kwargs)
+    for event in events:
+        yield event
+
+
+async def _run_scenario(
+    adk_agent: ADKAgent,
+    input_data: RunAgentInput,
+    events: Sequence[FakeEvent],
+    *,
+    capture: Optional[Dict[str, Any]] = None,
+    update_state: Optional[Callable[..., Awaitable[bool]]] = None,
+    stored_state: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Replay events through adk_agent.run() and drain what it emits."""
+    with patched_agent(
+        adk_agent,
+        run_async=partial(_replay_events, events, capture=capture),
+        update_state=update_state,
+        stored_state=stored_state,
+    ):
+        await drain(adk_agent.run(input_data))
 
 
 class TestInvocationIdNotPassedForStandaloneLlmAgent:
@@ -36,7 +111,7 @@ class TestInvocationIdNotPassedForStandaloneLlmAgent:
         yield
         SessionManager.reset_instance()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def simple_agent(self):
         return LlmAgent(
             name="test_agent",
@@ -44,233 +119,93 @@ class TestInvocationIdNotPassedForStandaloneLlmAgent:
             instruction="You are a helpful assistant.",
         )
 
-    @pytest.fixture
-    def resumable_adk_agent(self, simple_agent):
-        """ADKAgent with ResumabilityConfig enabled."""
-        app = App(
+    @pytest.fixture(scope="module")
+    def resumable_app(self, simple_agent):
+        return App(
             name="test_app",
             root_agent=simple_agent,
             resumability_config=ResumabilityConfig(is_resumable=True),
         )
-        return ADKAgent.from_app(app, user_id="test_user")
+
+    @pytest.fixture(scope="module")
+    def non_resumable_app(self, simple_agent):
+        return App(name="test_app", root_agent=simple_agent)
 
     @pytest.fixture
-    def non_resumable_adk_agent(self, simple_agent):
-        """ADKAgent without ResumabilityConfig."""
-        app = App(name="test_app", root_agent=simple_agent)
-        return ADKAgent.from_app(app, user_id="test_user")
+    def resumable_adk_agent(self, resumable_app):
+        """ADKAgent with ResumabilityConfig enabled."""
+        return ADKAgent.from_app(resumable_app, user_id="test_user")
 
-    def _make_mock_event(
-        self,
-        *,
-        author="test_agent",
-        text="Hello",
-        partial=False,
-        invocation_id="inv_123",
-        has_lro=False,
-        lro_tool_name="approve_plan",
-    ):
-        """Create a mock ADK event with sensible defaults."""
-        event = MagicMock()
-        event.author = author
-        event.partial = partial
-        event.invocation_id = invocation_id
-        event.turn_complete = not partial
-        event.actions = None
-
-        # Content with text part
-        text_part = MagicMock()
-        text_part.text = text
-        text_part.function_call = None
-        text_part.function_response = None
-
-        parts = [text_part]
-
-        if has_lro:
-            fc_part = MagicMock()
-            fc_part.text = None
-            fc = MagicMock()
-            fc.name = lro_tool_name
-            fc.id = f"fc_{uuid.uuid4().hex[:8]}"
-            fc.args = {"plan": {"topic": "test"}}
-            fc_part.function_call = fc
-            fc_part.function_response = None
-            parts.append(fc_part)
-            event.long_running_tool_ids = [fc.id]
-        else:
-            event.long_running_tool_ids = []
-
-        event.content = MagicMock()
-        event.content.parts = parts
-
-        event.is_final_response = MagicMock(return_value=not partial)
-        event.get_function_calls = MagicMock(return_value=[])
-        event.get_function_responses = MagicMock(return_value=[])
-
-        return event
+    @pytest.fixture
+    def non_resumable_adk_agent(self, non_resumable_app):
+        """ADKAgent without ResumabilityConfig."""
+        return ADKAgent.from_app(non_resumable_app, user_id="test_user")
 
     @pytest.mark.asyncio
-    async def test_no_invocation_id_in_run_kwargs_for_normal_run(
-        self, resumable_adk_agent
+    @pytest.mark.parametrize(
+        "message, event_specs, tools, stored_state",
+        [
+            pytest.param(
+                "Hello",
+                [dict(text="Hello world", partial=False, invocation_id="inv_abc123")],
+                [],
+                None,
+                id="normal_run",
+            ),
+            pytest.param(
+                "Plan something",
+                [
+                    dict(text="Let me plan", partial=True, invocation_id="inv_lro_test"),
+                    dict(
+                        text="",
+                        partial=False,
+                        invocation_id="inv_lro_test",
+                        has_lro=True,
+                        lro_tool_name="approve_plan",
+                    ),
+                ],
+                [_APPROVE_PLAN_TOOL],
+                None,
+                id="lro_run",
+            ),
+            # The exact production crash scenario: an LRO pause stored an
+            # invocation_id, the user clicks approve (tool_results), and the
+            # old code passed invocation_id to run_async, triggering
+            # _get_subagent_to_resume which fails for standalone LlmAgents.
+            pytest.param(
+                "Hello",
+                [dict(text="Approved", partial=False, invocation_id="inv_resumed")],
+                [_APPROVE_PLAN_TOOL],
+                {INVOCATION_ID_STATE_KEY: "inv_from_lro_pause"},
+                id="stored_id_with_tool_results",
+            ),
+        ],
+    )
+    async def test_no_invocation_id_in_run_kwargs(
+        self, resumable_adk_agent, message, event_specs, tools, stored_state
     ):
-        """Verify run_async does not receive invocation_id for a standalone LlmAgent normal run."""
+        """Verify run_async never receives invocation_id for a standalone LlmAgent."""
         adk_agent = resumable_adk_agent
         assert adk_agent._is_adk_resumable() is True
 
         run_async_kwargs_capture = {}
 
-        async def mock_run_async(**kwargs):
-            run_async_kwargs_capture.update(kwargs)
-            yield self._make_mock_event(
-                text="Hello world", partial=False, invocation_id="inv_abc123"
-            )
+        input_data = _make_input(message, tools=tools)
 
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Hello")],
-            state={},
-            tools=[],
-            context=[],
-            forwarded_props={},
+        await _run_scenario(
+            adk_agent,
+            input_data,
+            [make_fake_event(**spec) for spec in event_specs],
+            capture=run_async_kwargs_capture,
+            stored_state=stored_state,
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            new_callable=AsyncMock,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
-
-        # run_async should not receive invocation_id for standalone LlmAgent
-        assert "invocation_id" not in run_async_kwargs_capture, (
-            f"run_async should not receive invocation_id for standalone LlmAgent. "
-            f"Got kwargs: {run_async_kwargs_capture}"
-        )
-
-    @pytest.mark.asyncio
-    async def test_no_invocation_id_in_run_kwargs_for_lro_run(
-        self, resumable_adk_agent
-    ):
-        """Verify run_async does not receive invocation_id for standalone LlmAgent after LRO pause."""
-        adk_agent = resumable_adk_agent
-
-        run_async_kwargs_capture = {}
-
-        async def mock_run_async(**kwargs):
-            run_async_kwargs_capture.update(kwargs)
-            yield self._make_mock_event(
-                text="Let me plan", partial=True, invocation_id="inv_lro_test"
-            )
-            yield self._make_mock_event(
-                text="",
-                partial=False,
-                invocation_id="inv_lro_test",
-                has_lro=True,
-                lro_tool_name="approve_plan",
-            )
-
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Plan something")],
-            state={},
-            tools=[
-                AGUITool(
-                    name="approve_plan",
-                    description="Approve a plan",
-                    parameters={"type": "object", "properties": {}},
-                )
-            ],
-            context=[],
-            forwarded_props={},
-        )
-
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            new_callable=AsyncMock,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
-
         # run_async should not receive invocation_id for standalone LlmAgent
         assert "invocation_id" not in run_async_kwargs_capture, (
             f"run_async should not receive invocation_id for standalone LlmAgent. "
             f"Got kwargs: {run_async_kwargs_capture}"
         )
 
-    @pytest.mark.asyncio
-    async def test_no_invocation_id_in_run_kwargs_with_stored_id_and_tool_results(
-        self, resumable_adk_agent
-    ):
-        """Verify run_async does not receive invocation_id for standalone LlmAgent with stored id + tool results.
-
-        This is the exact production crash scenario: LRO pause stored an
-        invocation_id, user clicks approve (tool_results), and the old code
-        passed invocation_id to run_async triggering _get_subagent_to_resume
-        which fails for standalone LlmAgents.
-        """
-        adk_agent = resumable_adk_agent
-
-        run_async_kwargs_capture = {}
-
-        async def mock_run_async(**kwargs):
-            run_async_kwargs_capture.update(kwargs)
-            yield self._make_mock_event(
-                text="Approved", partial=False, invocation_id="inv_resumed"
-            )
-
-        async def mock_get_state(session_id, app_name, user_id):
-            return {INVOCATION_ID_STATE_KEY: "inv_from_lro_pause"}
-
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Hello")],
-            state={},
-            tools=[
-                AGUITool(
-                    name="approve_plan",
-                    description="Approve a plan",
-                    parameters={"type": "object", "properties": {}},
-                )
-            ],
-            context=[],
-            forwarded_props={},
-        )
-
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            new_callable=AsyncMock,
-        ), patch.object(
-            adk_agent._session_manager,
-            "get_session_state",
-            side_effect=mock_get_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
-
-        # Standalone LlmAgent: run_async must NOT receive the stored invocation_id
-        assert "invocation_id" not in run_async_kwargs_capture, (
-            f"run_async should not receive invocation_id for standalone LlmAgent, "
-            f"even with stored id and tool results. Got kwargs: {run_async_kwargs_capture}"
-        )
-
     @pytest.mark.asyncio
     async def test_stored_invocation_id_cleared_after_completed_run(
         self, resumable_adk_agent
@@ -281,50 +216,29 @@ class TestInvocationIdNotPassedForStandaloneLlmAgent:
         update_calls = []
 
         async def tracking_update_state(session_id, app_name, user_id, state):
-            update_calls.append({"state": dict(state) if state else {}})
+            update_calls.append(invocation_id_snapshot(state))
             return True
 
-        async def mock_run_async(**kwargs):
-            yield self._make_mock_event(
-                text="Response", partial=False, invocation_id="inv_new"
-            )
+        input_data = _make_input()
 
         # Simulate state with a stored invocation_id from a previous LRO pause
-        async def mock_get_state(session_id, app_name, user_id):
-            return {INVOCATION_ID_STATE_KEY: "inv_stale_from_lro"}
-
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Hello")],
-            state={},
-            tools=[],
-            context=[],
-            forwarded_props={},
+        await _run_scenario(
+            adk_agent,
+            input_data,
+            [
+                make_fake_event(
+                    text="Response", partial=False, invocation_id="inv_new"
+                )
+            ],
+            update_state=tracking_update_state,
+            stored_state={INVOCATION_ID_STATE_KEY: "inv_stale_from_lro"},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(
-            adk_agent._session_manager,
-            "get_session_state",
-            side_effect=mock_get_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
-
         # The stored invocation_id should be cleared
         invocation_clear_calls = [
             c
             for c in update_calls
-            if INVOCATION_ID_STATE_KEY in c["state"]
-            and c["state"][INVOCATION_ID_STATE_KEY] is None
+            if c["has_inv"] and c["inv_value"] is None
         ]
         assert len(invocation_clear_calls) >= 1, (
             f"Stored invocation_id should be cleared after completed run. "
@@ -342,40 +256,24 @@ class TestInvocationIdNotPassedForStandaloneLlmAgent:
         update_calls = []
 
         async def tracking_update_state(session_id, app_name, user_id, state):
-            update_calls.append({"state": dict(state) if state else {}})
+            update_calls.append(invocation_id_snapshot(state))
             return True
 
-        async def mock_run_async(**kwargs):
-            yield self._make_mock_event(
-                text="Response", partial=False, invocation_id="inv_nonresumable"
-            )
+        input_data = _make_input()
 
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Hello")],
-            state={},
-            tools=[],
-            context=[],
-            forwarded_props={},
+        await _run_scenario(
+            adk_agent,
+            input_data,
+            [
+                make_fake_event(
+                    text="Response", partial=False, invocation_id="inv_nonresumable"
+                )
+            ],
+            update_state=tracking_update_state,
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
-
         # No calls should reference INVOCATION_ID_STATE_KEY
-        invocation_calls = [
-            c for c in update_calls if INVOCATION_ID_STATE_KEY in c["state"]
-        ]
+        invocation_calls = [c for c in update_calls if c["has_inv"]]
         assert invocation_calls == [], (
             f"No invocation_id operations should happen without ResumabilityConfig. "
             f"Calls with invocation_id: {invocation_calls}"
@@ -400,52 +298,37 @@ class TestInvocationIdNotPassedForStandaloneLlmAgent:
 
         async def tracking_update_state(session_id, app_name, user_id, state):
             update_calls.append(
-                {
-                    "state": dict(state) if state else {},
-                    "during_run_loop": run_loop_active,
-                }
+                {**invocation_id_snapshot(state), "during_run_loop": run_loop_active}
             )
             return True
 
+        events = [
+            make_fake_event(text="Hello", partial=True, invocation_id="inv_abc123"),
+            make_fake_event(
+                text="Hello world", partial=False, invocation_id="inv_abc123"
+            ),
+        ]
+
         async def mock_run_async(**kwargs):
             nonlocal run_loop_active
             run_loop_active = True
-            yield self._make_mock_event(
-                text="Hello", partial=True, invocation_id="inv_abc123"
-            )
-            yield self._make_mock_event(
-                text="Hello world", partial=False, invocation_id="inv_abc123"
-            )
+            async for event in _replay_events(events):
+                yield event
             run_loop_active = False
 
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Hello")],
-            state={},
-            tools=[],
-            context=[],
-            forwarded_props={},
-        )
-
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            side_effect=tracking_update_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
+        input_data = _make_input()
 
-            events = [event async for event in adk_agent.run(input_data)]
+        with patched_agent(
+            adk_agent, run_async=mock_run_async, update_state=tracking_update_state
+        ):
+            await drain(adk_agent.run(input_data))
 
         # NO update_session_state call with INVOCATION_ID should happen
         # while the run loop is active
         mid_run_invocation_calls = [
             c
             for c in update_calls
-            if c["during_run_loop"] and INVOCATION_ID_STATE_KEY in c["state"]
+            if c["during_run_loop"] and c["has_inv"]
         ]
         assert mid_run_invocation_calls == [], (
             f"update_session_state was called with {INVOCATION_ID_STATE_KEY} "
@@ -499,36 +382,6 @@ class TestInvocationIdNotPassedForLlmAgentWithTransferTargets:
         )
         return ADKAgent.from_app(app, user_id="test_user")
 
-    def _make_mock_event(
-        self,
-        *,
-        author="router_agent",
-        text="Hello",
-        partial=False,
-        invocation_id="inv_123",
-    ):
-        """Create a mock ADK event with sensible defaults."""
-        event = MagicMock()
-        event.author = author
-        event.partial = partial
-        event.invocation_id = invocation_id
-        event.turn_complete = not partial
-        event.actions = None
-        event.long_running_tool_ids = []
-
-        text_part = MagicMock()
-        text_part.text = text
-        text_part.function_call = None
-        text_part.function_response = None
-
-        event.content = MagicMock()
-        event.content.parts = [text_part]
-        event.is_final_response = MagicMock(return_value=not partial)
-        event.get_function_calls = MagicMock(return_value=[])
-        event.get_function_responses = MagicMock(return_value=[])
-
-        return event
-
     @pytest.mark.asyncio
     async def test_no_invocation_id_for_llm_agent_with_transfer_targets(
         self, resumable_transfer_adk_agent
@@ -540,47 +393,23 @@ class TestInvocationIdNotPassedForLlmAgentWithTransferTargets:
 
         run_async_kwargs_capture = {}
 
-        async def mock_run_async(**kwargs):
-            run_async_kwargs_capture.update(kwargs)
-            yield self._make_mock_event(
-                text="Routed to agent_a", partial=False, invocation_id="inv_transfer"
-            )
-
-        async def mock_get_state(session_id, app_name, user_id):
-            return {INVOCATION_ID_STATE_KEY: "inv_stale_from_previous"}
-
-        input_data = RunAgentInput(
-            thread_id=f"test_{uuid.uuid4().hex[:8]}",
-            run_id=f"run_{uuid.uuid4().hex[:8]}",
-            messages=[UserMessage(id="msg1", content="Hello")],
-            state={},
-            tools=[
-                AGUITool(
-                    name="approve_plan",
-                    description="Approve a plan",
-                    parameters={"type": "object", "properties": {}},
+        input_data = _make_input(tools=[_APPROVE_PLAN_TOOL])
+
+        await _run_scenario(
+            adk_agent,
+            input_data,
+            [
+                make_fake_event(
+                    author="router_agent",
+                    text="Routed to agent_a",
+                    partial=False,
+                    invocation_id="inv_transfer",
                 )
             ],
-            context=[],
-            forwarded_props={},
+            capture=run_async_kwargs_capture,
+            stored_state={INVOCATION_ID_STATE_KEY: "inv_stale_from_previous"},
         )
 
-        with patch.object(
-            adk_agent._session_manager,
-            "update_session_state",
-            new_callable=AsyncMock,
-        ), patch.object(
-            adk_agent._session_manager,
-            "get_session_state",
-            side_effect=mock_get_state,
-        ), patch.object(adk_agent, "_create_runner") as mock_create_runner:
-            mock_runner = AsyncMock()
-            mock_runner.close = AsyncMock()
-            mock_runner.run_async = mock_run_async
-            mock_create_runner.return_value = mock_runner
-
-            events = [event async for event in adk_agent.run(input_data)]
-
         assert "invocation_id" not in run_async_kwargs_capture, (
             f"run_async should not receive invocation_id for LlmAgent with "
             f"transfer targets. Got kwargs: {run_async_kwargs_capture}"
@@ -15,7 +15,7 @@ from ag_ui_adk.config import PredictStateMapping
 
 def _event_types(events):
     """Extract event type names from a list of events."""
-    return [str(ev.type).split('.')[-1] for ev in events]
+    return [ev.type.name for ev in events]
 
 
 def _make_adk_event(
@@ -84,7 +84,7 @@ async def test_streaming_fc_first_chunk_emits_start():
     types = _event_types(events)
 
     assert "TOOL_CALL_START" in types
-    start_event = [e for e in events if "TOOL_CALL_START" in str(e.type)][0]
+    start_event = next(e for e in events if e.type == EventType.TOOL_CALL_START)
     assert start_event.tool_call_name == "write_document"
     assert start_event.tool_call_id is not None
 
@@ -127,7 +127,7 @@ async def test_streaming_fc_continuation_emits_args():
     types = _event_types(events)
 
     assert "TOOL_CALL_ARGS" in types
-    args_event = [e for e in events if "TOOL_CALL_ARGS" in str(e.type)][0]
+    args_event = next(e for e in events if e.type == EventType.TOOL_CALL_ARGS)
     assert "document" in args_event.delta
     assert "Hello world" in args_event.delta
 
@@ -161,7 +161,7 @@ async def test_streaming_fc_multiple_continuations():
     assert "TOOL_CALL_ARGS" in _event_types(chunk2_events)
 
     # Second delta should just be the escaped text (no key prefix)
-    args2 = [e for e in chunk2_events if "TOOL_CALL_ARGS" in str(e.type)][0]
+    args2 = next(e for e in chunk2_events if e.type == EventType.TOOL_CALL_ARGS)
     assert args2.delta == "a time"
 
 
@@ -196,7 +196,7 @@ async def test_streaming_fc_end_emits_end():
     assert "TOOL_CALL_END" in types
 
     # Closing JSON delta should be '"}'
-    closing = [e for e in events if "TOOL_CALL_ARGS" in str(e.type)][0]
+    closing = next(e for e in events if e.type == EventType.TOOL_CALL_ARGS)
     assert closing.delta == '"}'
 
 
@@ -256,7 +256,7 @@ async def test_streaming_fc_json_deltas_concatenate():
     all_events += await _collect_events(translator, _make_adk_event(func_calls=[fc_end], partial=True))
 
     # Concatenate all TOOL_CALL_ARGS deltas
-    args_deltas = [e.delta for e in all_events if "TOOL_CALL_ARGS" in str(e.type)]
+    args_deltas = [e.delta for e in all_events if e.type == EventType.TOOL_CALL_ARGS]
     full_json = "".join(args_deltas)
 
     # Should be valid JSON
@@ -466,7 +466,7 @@ async def test_streaming_fc_special_chars_escaped():
 
     # Concatenate all args deltas and verify valid JSON
     all_events = events + end_events
-    args_deltas = [e.delta for e in all_events if "TOOL_CALL_ARGS" in str(e.type)]
+    args_deltas = [e.delta for e in all_events if e.type == EventType.TOOL_CALL_ARGS]
     full_json = "".join(args_deltas)
     parsed = json.loads(full_json)
     assert parsed == {"document": 'He said "hello"\nNew line'}
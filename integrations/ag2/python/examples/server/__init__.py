@@ -4,6 +4,7 @@ Exposes AG-UI compatible endpoints using AG2's AGUIStream.
 """
 
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from dotenv import load_dotenv
@@ -20,7 +21,16 @@ from .api import (
     tool_based_generative_ui,
 )
 
-app = FastAPI(title="AG2 AG-UI server")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    # Mounted sub-apps get no lifespan events of their own, so shared
+    # resources they hold are released here.
+    await backend_tool_rendering.close_http_client()
+
+
+app = FastAPI(title="AG2 AG-UI server", lifespan=lifespan)
 app.mount(
     "/agentic_chat",
     agentic_chat.agentic_chat_app,
@@ -56,10 +66,16 @@ app.mount(
 def main():
     """Start the FastAPI server."""
     port = int(os.getenv("PORT", "8018"))
+    uvicorn.run(app, host="0.0.0.0", port=port)
+
+
+def main_dev():
+    """Start the FastAPI server with auto-reload for local development."""
+    port = int(os.getenv("PORT", "8018"))
     uvicorn.run("server:app", host="0.0.0.0", port=port, reload=True)
 
 
 if __name__ == "__main__":
     main()
 
-__all__ = ["main"]
+__all__ = ["main", "main_dev"]
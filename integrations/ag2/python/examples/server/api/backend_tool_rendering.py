@@ -14,33 +14,59 @@ from autogen import ConversableAgent, LLMConfig
 from autogen.ag_ui import AGUIStream
 
 
+# Shared by every get_weather call so the open-meteo connections are kept
+# alive between tool calls instead of re-handshaking each time. Closed by the
+# server's lifespan (see close_http_client).
+_http_client = httpx.AsyncClient()
+
+
+async def close_http_client() -> None:
+    """Close the shared open-meteo HTTP client."""
+    await _http_client.aclose()
+
+
+# Reported key -> open-meteo "current" field. weather_code is requested too
+# and mapped through _WEATHER_CONDITIONS.
+_REPORTED_FIELDS = {
+    "temperature": "temperature_2m",
+    "feels_like": "apparent_temperature",
+    "humidity": "relative_humidity_2m",
+    "wind_speed": "wind_speed_10m",
+    "wind_gust": "wind_gusts_10m",
+}
+_REQUIRED_CURRENT_FIELDS = frozenset((*_REPORTED_FIELDS.values(), "weather_code"))
+_CURRENT_QUERY = ",".join((*_REPORTED_FIELDS.values(), "weather_code"))
+
+# WMO weather code -> human-readable condition.
+_WEATHER_CONDITIONS = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Foggy",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    71: "Slight snow fall",
+    73: "Moderate snow fall",
+    75: "Heavy snow fall",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    85: "Slight snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail",
+}
+
+
 def get_weather_condition(code: int) -> str:
     """Map WMO weather code to human-readable condition."""
-    conditions = {
-        0: "Clear sky",
-        1: "Mainly clear",
-        2: "Partly cloudy",
-        3: "Overcast",
-        45: "Foggy",
-        48: "Depositing rime fog",
-        51: "Light drizzle",
-        53: "Moderate drizzle",
-        55: "Dense drizzle",
-        61: "Slight rain",
-        63: "Moderate rain",
-        65: "Heavy rain",
-        71: "Slight snow fall",
-        73: "Moderate snow fall",
-        75: "Heavy snow fall",
-        80: "Slight rain showers",
-        81: "Moderate rain showers",
-        85: "Slight snow showers",
-        86: "Heavy snow showers",
-        95: "Thunderstorm",
-        96: "Thunderstorm with slight hail",
-        99: "Thunderstorm with heavy hail",
-    }
-    return conditions.get(code, "Unknown")
+    return _WEATHER_CONDITIONS.get(code, "Unknown")
 
 
 def _mock_weather(location: str) -> str:
@@ -72,40 +98,39 @@ async def get_weather(location: str) -> str:
     if os.getenv("AG_UI_MOCK_WEATHER"):
         return _mock_weather(location)
 
-    async with httpx.AsyncClient() as client:
-        geocoding_url = (
-            f"https://geocoding-api.open-meteo.com/v1/search?name={location}&count=1"
+    geocoding_url = (
+        f"https://geocoding-api.open-meteo.com/v1/search?name={location}&count=1"
+    )
+    geocoding_response = await _http_client.get(geocoding_url)
+    geocoding_data = geocoding_response.json()
+
+    if not geocoding_data.get("results"):
+        raise ValueError(f"Location '{location}' not found")
+
+    result = geocoding_data["results"][0]
+    latitude = result["latitude"]
+    longitude = result["longitude"]
+    name = result["name"]
+
+    weather_url = (
+        f"https://api.open-meteo.com/v1/forecast?"
+        f"latitude={latitude}&longitude={longitude}"
+        f"&current={_CURRENT_QUERY}"
+    )
+    weather_response = await _http_client.get(weather_url)
+    weather_data = weather_response.json()
+    current = weather_data["current"]
+
+    missing = _REQUIRED_CURRENT_FIELDS.difference(current)
+    if missing:
+        raise ValueError(
+            f"Incomplete weather data for '{name}'. Missing: {', '.join(sorted(missing))}"
         )
-        geocoding_response = await client.get(geocoding_url)
-        geocoding_data = geocoding_response.json()
-
-        if not geocoding_data.get("results"):
-            raise ValueError(f"Location '{location}' not found")
-
-        result = geocoding_data["results"][0]
-        latitude = result["latitude"]
-        longitude = result["longitude"]
-        name = result["name"]
-
-        weather_url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={latitude}&longitude={longitude}"
-            f"&current=temperature_2m,apparent_temperature,relative_humidity_2m,"
-            f"wind_speed_10m,wind_gusts_10m,weather_code"
-        )
-        weather_response = await client.get(weather_url)
-        weather_data = await weather_response.json()
-        current = weather_data["current"]
-
-        return json.dumps({
-            "temperature": current["temperature_2m"],
-            "feels_like": current["apparent_temperature"],
-            "humidity": current["relative_humidity_2m"],
-            "wind_speed": current["wind_speed_10m"],
-            "wind_gust": current["wind_gusts_10m"],
-            "conditions": get_weather_condition(current["weather_code"]),
-            "location": name,
-        })
+
+    weather = {key: current[field] for key, field in _REPORTED_FIELDS.items()}
+    weather["conditions"] = get_weather_condition(current["weather_code"])
+    weather["location"] = name
+    return json.dumps(weather)
 
 
 agent = ConversableAgent(
@@ -22,12 +22,13 @@ from __future__ import annotations
 
 import ast
 import os
+import re
 import json
 import uuid
 import logging
 import traceback
 from contextvars import ContextVar
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from json_repair import repair_json
 
 # AG‑UI Python SDK (events)
@@ -89,36 +90,74 @@ class AgUiSpanProcessor(SpanProcessor):
         # Track if any text chunk has been emitted for a given LLM span
         self._llm_chunks_seen: Dict[str, bool] = {}
         # Track tool-call lifecycles seen via streaming to avoid double-emitting
-        self._started_tool_calls: Dict[str, Any] = {}
+        # (call_id -> parent message_id)
+        self._started_tool_calls: Dict[str, str] = {}
         self._runtime = runtime
         # Correlate tool results with tool calls
         # tool_call_id is only available in the on_tool_start event
         # and not the on_tool_end event
         self._tool_run_id_to_tool_call_id: Dict[str, str] = {}
-
-    def _emit(self, event_obj) -> None:
+        # Per-event-type translation handlers. A None entry means the event
+        # type produces no AG-UI events (LlmGenerationRequest, or an
+        # unhandled type cached by _gather_events_for_event).
+        self._event_handlers: Dict[type, Optional[Callable[[Any, Span], List[Any]]]] = {
+            LlmGenerationChunkReceived: self._events_for_llm_chunk,
+            LlmGenerationRequest: None,
+            LlmGenerationResponse: self._events_for_llm_response,
+            ToolExecutionRequest: self._events_for_tool_request,
+            ToolExecutionResponse: self._events_for_tool_response,
+            ExceptionRaised: self._events_for_exception,
+        }
+
+    # The queue is resolved from EVENT_QUEUE on every callback rather than
+    # cached on the processor: one AgentSpecAgent (and so one processor) serves
+    # concurrent requests, each with its own queue in its own context. Within a
+    # callback it is looked up once, however many AG-UI events it produced.
+    @staticmethod
+    def _event_queue():
         queue = EVENT_QUEUE.get()
         if queue is None:
             raise RuntimeError("AG-UI event queue is not set")
-        queue.put_nowait(event_obj)
-        if self._debug:
+        return queue
+
+    @staticmethod
+    def _log_debug(events: Sequence[Any]) -> None:
+        for event_obj in events:
             logger.info(
                 "AGUI DEBUG event=%s payload=%s",
                 type(event_obj).__name__,
                 _safe_model_dump(event_obj),
             )
 
+    def _emit(self, event_obj) -> None:
+        self._emit_all((event_obj,))
+
+    def _emit_all(self, events: Sequence[Any]) -> None:
+        if not events:
+            return
+        queue = self._event_queue()
+        for event_obj in events:
+            queue.put_nowait(event_obj)
+        if self._debug:
+            self._log_debug(events)
+
     async def _aemit(self, event_obj) -> None:
-        queue = EVENT_QUEUE.get()
-        if queue is None:
-            raise RuntimeError("AG-UI event queue is not set")
-        await queue.put(event_obj)
+        await self._aemit_all((event_obj,))
+
+    async def _aemit_all(self, events: Sequence[Any]) -> None:
+        if not events:
+            return
+        queue = self._event_queue()
+        # The endpoint's queue is unbounded, so put() would never wait; only
+        # a bounded queue needs the awaitable (back-pressuring) path.
+        if queue.maxsize <= 0:
+            for event_obj in events:
+                queue.put_nowait(event_obj)
+        else:
+            for event_obj in events:
+                await queue.put(event_obj)
         if self._debug:
-            logger.info(
-                "AGUI DEBUG event=%s payload=%s",
-                type(event_obj).__name__,
-                _safe_model_dump(event_obj),
-            )
+            self._log_debug(events)
 
     @property
     def _run_started_event(self):
@@ -141,29 +180,23 @@ class AgUiSpanProcessor(SpanProcessor):
         await self._aemit(self._run_finished_event)
 
     def on_start(self, span: Span) -> None:
-        for ev in self._gather_start_events(span):
-            self._emit(ev)
+        self._emit_all(self._gather_start_events(span))
 
     def on_end(self, span: Span) -> None:
-        for ev in self._gather_end_events(span):
-            self._emit(ev)
+        self._emit_all(self._gather_end_events(span))
 
     async def on_start_async(self, span: Span) -> None:
-        for ev in self._gather_start_events(span):
-            await self._aemit(ev)
+        await self._aemit_all(self._gather_start_events(span))
 
     async def on_end_async(self, span: Span) -> None:
-        for ev in self._gather_end_events(span):
-            await self._aemit(ev)
+        await self._aemit_all(self._gather_end_events(span))
 
     # Event routing
     def on_event(self, event: Event, span: Span, *args: Any, **kwargs: Any) -> None:
-        for ev in self._gather_events_for_event(event, span):
-            self._emit(ev)
+        self._emit_all(self._gather_events_for_event(event, span))
 
     async def on_event_async(self, event: Event, span: Span) -> None:
-        for ev in self._gather_events_for_event(event, span):
-            await self._aemit(ev)
+        await self._aemit_all(self._gather_events_for_event(event, span))
 
     # Internal helpers to keep sync/async paths DRY
     def _gather_start_events(self, span: Span) -> List[Any]:
@@ -183,201 +216,241 @@ class AgUiSpanProcessor(SpanProcessor):
         return events
 
     def _gather_events_for_event(self, event: Event, span: Span) -> List[Any]:
+        event_type = type(event)
+        try:
+            handler = self._event_handlers[event_type]
+        except KeyError:
+            # Subclass of a handled event: resolve it once via the MRO, then
+            # cache it so later events of that type take the direct lookup.
+            handler = next(
+                (self._event_handlers[base] for base in event_type.__mro__ if base in self._event_handlers),
+                None,
+            )
+            self._event_handlers[event_type] = handler
+        if handler is None:
+            return []
+        return handler(event, span)
+
+    def _events_for_llm_chunk(self, event: LlmGenerationChunkReceived, span: Span) -> List[Any]:
         events: List[Any] = []
-        match event:
-            case LlmGenerationChunkReceived():
-                # WayFlow does not assign completion_id in streaming, falling back to request_id
-                message_id = event.completion_id or event.request_id
-                if not message_id:
-                    raise ValueError("Expected assistant message id for text chunk")
-                if event.content:
-                    events.append(
-                        TextMessageChunkEvent(
-                            message_id=message_id,
-                            role="assistant",
-                            delta=_escape_html(event.content),
-                        )
-                    )
-                    self._llm_chunks_seen[span.id] = True
-                if event.tool_calls:
-                    if len(event.tool_calls) != 1:
-                        raise ValueError("expected exactly one tool call chunk")
-                    tool_call_chunk = event.tool_calls[0]
-                    tool_name = tool_call_chunk.tool_name
-                    tool_call_id = tool_call_chunk.call_id
-                    if tool_call_id not in self._started_tool_calls:
-                        self._started_tool_calls[tool_call_id] = {"message_id": message_id}
-                    events.append(
-                        ToolCallChunkEvent(
-                            tool_call_id=tool_call_id,
-                            parent_message_id=message_id,
-                            tool_call_name=tool_name,
-                            delta=tool_call_chunk.arguments,
-                        )
-                    )
-            case LlmGenerationRequest():
-                return events  # not used for AG-UI
-            case LlmGenerationResponse():
-                message_id = event.completion_id
-                if not message_id:
-                    raise ValueError("Expected assistant message id in LLM response")
-                # If no text chunks were streamed in this span, emit the full completion text as a single content event
-                if not self._llm_chunks_seen.get(span.id, False):
-                    completion_text = event.content
-                    if completion_text:
-                        events.append(
-                            TextMessageChunkEvent(
-                                message_id=message_id,
-                                role="assistant",
-                                delta=_escape_html(completion_text),
-                            )
-                        )
-                    self._llm_chunks_seen[span.id] = True
-                # if a tool_call was not streamed, emit a single ToolCallChunkEvent
-                # Normalize arguments to a JSON string so frontends can JSON.parse() reliably
-                for tool_call in event.tool_calls:
-                    if tool_call.call_id not in self._started_tool_calls:
-                        args_dict = json.loads(tool_call.arguments)
-                        if isinstance(args_dict, dict) and (a2ui_json := args_dict.get("a2ui_json")):
-                            args_dict["a2ui_json"] = repair_a2ui_json(a2ui_json)
-                        tool_call.arguments = json.dumps(args_dict)
-
-                        events.append(
-                            ToolCallChunkEvent(
-                                tool_call_id=tool_call.call_id,
-                                parent_message_id=message_id,
-                                tool_call_name=tool_call.tool_name,
-                                delta=tool_call.arguments,
-                            )
-                        )
-                        self._started_tool_calls[tool_call.call_id] = {"message_id": message_id}
-            case ToolExecutionRequest():
-                if self._runtime != "langgraph" and event.request_id not in self._started_tool_calls:
-                    events.append(
-                        ToolCallChunkEvent(
-                            tool_call_id=event.request_id,
-                            tool_call_name=event.tool.name,
-                            delta=json.dumps(event.inputs),
-                        )
+        # WayFlow does not assign completion_id in streaming, falling back to request_id
+        message_id = event.completion_id or event.request_id
+        if not message_id:
+            raise ValueError("Expected assistant message id for text chunk")
+        # Chunk events are built with model_construct: every field comes from
+        # an already-validated pyagentspec event (str ids/content), and the
+        # `type` literal default is filled in by model_construct.
+        if event.content:
+            events.append(
+                TextMessageChunkEvent.model_construct(
+                    message_id=message_id,
+                    role="assistant",
+                    delta=_escape_html(event.content),
+                )
+            )
+            self._llm_chunks_seen[span.id] = True
+        if event.tool_calls:
+            if len(event.tool_calls) != 1:
+                raise ValueError("expected exactly one tool call chunk")
+            tool_call_chunk = event.tool_calls[0]
+            tool_name = tool_call_chunk.tool_name
+            tool_call_id = tool_call_chunk.call_id
+            if tool_call_id not in self._started_tool_calls:
+                self._started_tool_calls[tool_call_id] = message_id
+            events.append(
+                ToolCallChunkEvent.model_construct(
+                    tool_call_id=tool_call_id,
+                    parent_message_id=message_id,
+                    tool_call_name=tool_name,
+                    delta=tool_call_chunk.arguments,
+                )
+            )
+        return events
+
+    def _events_for_llm_response(self, event: LlmGenerationResponse, span: Span) -> List[Any]:
+        events: List[Any] = []
+        message_id = event.completion_id
+        if not message_id:
+            raise ValueError("Expected assistant message id in LLM response")
+        # If no text chunks were streamed in this span, emit the full completion text as a single content event
+        if not self._llm_chunks_seen.get(span.id, False):
+            completion_text = event.content
+            if completion_text:
+                events.append(
+                    TextMessageChunkEvent.model_construct(
+                        message_id=message_id,
+                        role="assistant",
+                        delta=_escape_html(completion_text),
                     )
-                    self._started_tool_calls[event.request_id] = {
-                        "message_id": span.id  # no need for accurate message_id here
-                    }
-                if self._runtime == "langgraph":
-                    tool_call_id = span.description.replace("tcid__", "")
-                    self._tool_run_id_to_tool_call_id[event.request_id] = tool_call_id
-            case ToolExecutionResponse():
-                if self._runtime == "langgraph":
-                    # The correlation map is populated from the matching
-                    # ToolExecutionRequest. If that request was never seen
-                    # (out-of-order events, or a request span lacking a
-                    # ``tcid__`` description), fall back to the run-level
-                    # request_id rather than raising a KeyError.
-                    if event.request_id in self._tool_run_id_to_tool_call_id:
-                        tool_call_id = self._tool_run_id_to_tool_call_id[event.request_id]
-                    else:
-                        # Correlation miss: no matching ToolExecutionRequest was
-                        # recorded for this request_id, so we cannot recover the
-                        # AG-UI tool_call_id the frontend issued. We surrogate the
-                        # raw request_id to avoid crashing, but the resulting tool
-                        # result will be orphaned (it references an id the client
-                        # never saw). Log it so the miss is observable.
-                        logger.warning(
-                            "AG-UI tool-call correlation miss: no ToolExecutionRequest "
-                            "recorded for request_id=%r; using the raw request_id as a "
-                            "surrogate tool_call_id. The emitted tool result may be "
-                            "orphaned because the frontend never saw this id.",
-                            event.request_id,
-                        )
-                        tool_call_id = event.request_id
-                else:
-                    tool_call_id = event.request_id
-                content = _normalize_tool_output(event.outputs)
-                # Tool results are emitted as separate "tool" messages on the client.
-                # Use a unique message_id here (not the parent assistant message id), otherwise
-                # the message list can contain duplicate IDs (assistant + tool), which breaks
-                # React keys and message deduping logic downstream.
-                #
-                # Generate a fresh id so tool results never collide with assistant/user ids.
-                tool_message_id = str(uuid.uuid4())
+                )
+            self._llm_chunks_seen[span.id] = True
+        # if a tool_call was not streamed, emit a single ToolCallChunkEvent
+        # Normalize arguments to a JSON string so frontends can JSON.parse() reliably
+        for tool_call in event.tool_calls:
+            if tool_call.call_id not in self._started_tool_calls:
+                args_dict = json.loads(tool_call.arguments)
+                if isinstance(args_dict, dict) and (a2ui_json := args_dict.get("a2ui_json")):
+                    args_dict["a2ui_json"] = repair_a2ui_json(a2ui_json)
+                tool_call.arguments = json.dumps(args_dict)
+
                 events.append(
-                    ToolCallResultEvent(
-                        message_id=tool_message_id,
-                        tool_call_id=tool_call_id,
-                        content=content,
-                        role="tool",
+                    ToolCallChunkEvent.model_construct(
+                        tool_call_id=tool_call.call_id,
+                        parent_message_id=message_id,
+                        tool_call_name=tool_call.tool_name,
+                        delta=tool_call.arguments,
                     )
                 )
-            case ExceptionRaised():
-                raise RuntimeError(
-                    "[AG-UI SpanProcessor] ExceptionRaised occurred during agent execution:"
-                    + event.exception_message
-                    + f"\n\nStacktrace: {traceback.format_exc()}"
+                self._started_tool_calls[tool_call.call_id] = message_id
+        return events
+
+    def _events_for_tool_request(self, event: ToolExecutionRequest, span: Span) -> List[Any]:
+        events: List[Any] = []
+        if self._runtime != "langgraph" and event.request_id not in self._started_tool_calls:
+            events.append(
+                ToolCallChunkEvent.model_construct(
+                    tool_call_id=event.request_id,
+                    tool_call_name=event.tool.name,
+                    delta=json.dumps(event.inputs),
                 )
-            case _:
-                return events
+            )
+            # no need for an accurate message_id here
+            self._started_tool_calls[event.request_id] = span.id
+        if self._runtime == "langgraph":
+            tool_call_id = span.description.replace("tcid__", "")
+            self._tool_run_id_to_tool_call_id[event.request_id] = tool_call_id
         return events
 
+    def _events_for_tool_response(self, event: ToolExecutionResponse, span: Span) -> List[Any]:
+        if self._runtime == "langgraph":
+            # The correlation map is populated from the matching
+            # ToolExecutionRequest. If that request was never seen
+            # (out-of-order events, or a request span lacking a
+            # ``tcid__`` description), fall back to the run-level
+            # request_id rather than raising a KeyError.
+            if event.request_id in self._tool_run_id_to_tool_call_id:
+                tool_call_id = self._tool_run_id_to_tool_call_id[event.request_id]
+            else:
+                # Correlation miss: no matching ToolExecutionRequest was
+                # recorded for this request_id, so we cannot recover the
+                # AG-UI tool_call_id the frontend issued. We surrogate the
+                # raw request_id to avoid crashing, but the resulting tool
+                # result will be orphaned (it references an id the client
+                # never saw). Log it so the miss is observable.
+                logger.warning(
+                    "AG-UI tool-call correlation miss: no ToolExecutionRequest "
+                    "recorded for request_id=%r; using the raw request_id as a "
+                    "surrogate tool_call_id. The emitted tool result may be "
+                    "orphaned because the frontend never saw this id.",
+                    event.request_id,
+                )
+                tool_call_id = event.request_id
+        else:
+            tool_call_id = event.request_id
+        content = _normalize_tool_output(event.outputs)
+        # Tool results are emitted as separate "tool" messages on the client.
+        # Use a unique message_id here (not the parent assistant message id), otherwise
+        # the message list can contain duplicate IDs (assistant + tool), which breaks
+        # React keys and message deduping logic downstream.
+        #
+        # Generate a fresh id so tool results never collide with assistant/user ids.
+        tool_message_id = str(uuid.uuid4())
+        return [
+            ToolCallResultEvent(
+                message_id=tool_message_id,
+                tool_call_id=tool_call_id,
+                content=content,
+                role="tool",
+            )
+        ]
+
+    def _events_for_exception(self, event: ExceptionRaised, span: Span) -> List[Any]:
+        raise RuntimeError(
+            "[AG-UI SpanProcessor] ExceptionRaised occurred during agent execution:"
+            + event.exception_message
+            + f"\n\nStacktrace: {traceback.format_exc()}"
+        )
+
 
 def repair_a2ui_json(a2ui_json: Any) -> str:
     if isinstance(a2ui_json, (list, dict)):
         parsed = a2ui_json
     elif isinstance(a2ui_json, str):
-        s = a2ui_json.strip()
+        # json.loads already skips surrounding whitespace, so only the repair
+        # fallback needs a stripped copy.
         try:
-            parsed = json.loads(s)
+            parsed = json.loads(a2ui_json)
         except json.JSONDecodeError:
-            s2 = repair_json(s)
-            parsed = json.loads(s2)
+            parsed = json.loads(repair_json(a2ui_json.strip()))
     else:
         raise NotImplementedError(f"Unexpected type for a2ui_json: {type(a2ui_json)}")
     return json.dumps(parsed, ensure_ascii=False)
 
 
+_HTML_SPECIAL_RE = re.compile(r"[&<>]")
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
 def _escape_html(text: str) -> str:
     if text is None:
         return ""
-    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    text = str(text)
+    # Most streamed deltas contain none of these; hand those back untouched.
+    if _HTML_SPECIAL_RE.search(text) is None:
+        return text
+    return text.translate(_HTML_ESCAPE_TABLE)
 
 
 def _normalize_tool_output(outputs: Any) -> str:
     """Return a JSON string for AG-UI ToolCallResultEvent.content without double-encoding.
 
     Rules:
-    - If outputs is a dict with a single key (e.g., {"weather_result": <value>}) and the inner
-        value is itself JSON-like (dict/list or a JSON string), unwrap to the inner value for UI convenience.
+    - If outputs is a dict with a single key (e.g., {"weather_result": <value>}), unwrap to the
+        inner value for UI convenience.
     - If content is already a dict/list, serialize exactly once via json.dumps.
     - If content is a string that is valid JSON, pass it through unchanged (don’t wrap again).
     - Otherwise, stringify primitives.
     """
     content: Any = outputs
-    # Unwrap single-key dicts to their inner value when appropriate
+    # Unwrap single-key dicts to their inner value
     if isinstance(outputs, dict) and len(outputs) == 1:
-        inner = next(iter(outputs.values()))
-        # If inner is a dict/list, prefer that directly; if it's a JSON string, keep as string
-        if isinstance(inner, (dict, list)):
-            content = inner
-        else:
-            content = inner
+        (content,) = outputs.values()
     # If it’s already a dict/list, serialize exactly once
     if isinstance(content, (dict, list)):
         return json.dumps(content)
+    if not isinstance(content, str):
+        return str(content)
     # If it’s a string that looks like JSON, pass through as-is (frontend will parse)
-    if isinstance(content, str) and jsonable(content):
+    if jsonable(content):
         return content
-    if isinstance(content, str):
+    # Python-literal fallback (e.g. a dict repr). Plain prose can never be a
+    # literal, so skip the parse unless the text opens like one.
+    if _may_be_python_literal(content):
         try:
             content_dict = ast.literal_eval(content)
             return json.dumps(content_dict)
-        except:
+        except Exception:
             pass
-    # Fallback: stringify primitives
-    return str(content)
+    return content
+
+
+# Containers, strings (including u/r/b prefixes) and numbers, including ".5".
+_LITERAL_START_CHARS = frozenset("{[(\"'+-.0123456789uUrRbB")
+_LITERAL_KEYWORDS = frozenset(("True", "False", "None"))
+
+
+def _may_be_python_literal(text: str) -> bool:
+    # Leading whitespace, newlines included, does not stop a successful
+    # ast.literal_eval, so skip past all of it before looking.
+    stripped = text.lstrip()
+    return bool(stripped) and (
+        stripped[0] in _LITERAL_START_CHARS or stripped.rstrip() in _LITERAL_KEYWORDS
+    )
 
 
 def jsonable(string):
     try:
         json.loads(string)
         return True
-    except:
+    except Exception:
         return False
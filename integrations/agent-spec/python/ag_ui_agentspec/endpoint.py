@@ -50,17 +50,36 @@ def add_agentspec_fastapi_endpoint(app: FastAPI, agentspec_agent: AgentSpecAgent
                 # Important: create the task after setting the ContextVar so the new Task inherits it
                 asyncio.create_task(run_and_close())
 
-                while True:
-                    item = await queue.get()
-                    if item is None:
-                        break
-
-                    # Patch lifecycle events with canonical thread/run IDs for the frontend
-                    if item.type == EventType.RUN_STARTED or item.type == EventType.RUN_FINISHED:
-                        item.thread_id = input_data.thread_id
-                        item.run_id = input_data.run_id
-
-                    yield encoder.encode(item)
+                done = False
+                while not done:
+                    # Wake once, then take everything the agent has queued since, so
+                    # a burst of streamed chunks goes out as one response write.
+                    batch = [await queue.get()]
+                    while not queue.empty():
+                        batch.append(queue.get_nowait())
+
+                    encoded = []
+                    try:
+                        for item in batch:
+                            if item is None:
+                                done = True
+                                break
+
+                            # Patch lifecycle events with canonical thread/run IDs for the frontend
+                            if item.type == EventType.RUN_STARTED or item.type == EventType.RUN_FINISHED:
+                                item.thread_id = input_data.thread_id
+                                item.run_id = input_data.run_id
+
+                            encoded.append(encoder.encode(item))
+                    except Exception:
+                        # Send the frames encoded before the failure, as the
+                        # per-event loop did, then let the handler below report it.
+                        if encoded:
+                            yield "".join(encoded)
+                        raise
+
+                    if encoded:
+                        yield "".join(encoded)
 
             except Exception as e:  # pylint: disable=broad-exception-caught
                 yield encoder.encode(
@@ -1,55 +1,62 @@
 import logging
 import traceback
-from typing import Any, Dict, List
+from typing import AbstractSet, Any, Dict, List, Set
 
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph.state import CompiledStateGraph
 
 from ag_ui.core import RunAgentInput
-from ag_ui_agentspec.agentspec_tracing_exporter import EVENT_QUEUE
 
 logger = logging.getLogger("ag_ui_agentspec.tracing")
 
 async def run_langgraph_agent(agent: CompiledStateGraph, input_data: RunAgentInput) -> None:
-    input_messages = prepare_langgraph_agent_inputs(input_data)
-    input_messages = await filter_only_new_messages(agent, input_data.thread_id, input_messages)
+    # Look up the checkpointed ids first so messages LangGraph already has are
+    # skipped before they are dumped, instead of dumping the whole history and
+    # filtering afterwards.
+    existing_ids = await _existing_message_ids(agent, input_data.thread_id)
+    input_messages = prepare_langgraph_agent_inputs(input_data, skip_ids=existing_ids)
     config = RunnableConfig({"configurable": {"thread_id": input_data.thread_id}})
-    current_queue = EVENT_QUEUE.get()
-    token = EVENT_QUEUE.set(current_queue)
+    # astream runs on this event loop in the caller's context, so the
+    # endpoint's EVENT_QUEUE is already visible to the span processor.
+    # The yielded items are discarded (AG-UI events come from tracing), but
+    # stream_mode="messages" must stay: it attaches LangGraph's streaming
+    # callback handler, which is what makes chat models stream tokens.
+    # ainvoke() or stream_mode="updates" would collapse every LLM turn into a
+    # single response event.
     try:
         async for _ in agent.astream({"messages": input_messages}, stream_mode="messages", config=config):
             pass
     except Exception as e:
-        logger.exception(
-            "LangGraph agent crashed with error: %s%s",
-            repr(e),
-            traceback.format_exc(),
-        )
+        # logger.exception already attaches the traceback to the record.
+        logger.exception("LangGraph agent crashed with error: %r", e)
         raise RuntimeError(f"LangGraph agent crashed with error: {repr(e)}\n\nTraceback: {traceback.format_exc()}")
-    finally:
-        EVENT_QUEUE.reset(token)
 
 
-def prepare_langgraph_agent_inputs(input_data: RunAgentInput) -> List[Dict[str, Any]]:
+# Keys LangGraph rejects per role, left out of the dump instead of deleted after it.
+_EXCLUDED_KEYS_BY_ROLE = {
+    "user": {"name"},
+    "assistant": {"name"},
+    "tool": {"error"},
+}
+
+
+def prepare_langgraph_agent_inputs(
+    input_data: RunAgentInput, skip_ids: AbstractSet[str] = frozenset()
+) -> List[Dict[str, Any]]:
     messages = input_data.messages
     if not messages:
         return []
-    messages_to_return = []
-    for m in messages:
-        m_dict = m.model_dump()
-        if m_dict["role"] in {"user", "assistant"} and "name" in m_dict:
-            del m_dict["name"]
-        if m_dict["role"] == "tool" and "error" in m_dict:
-            del m_dict["error"]
-        if m_dict["role"] == "assistant" and m_dict["content"] is None:
-            m_dict["content"] = ""
-        messages_to_return.append(m_dict)
-    return messages_to_return
+    return [_to_langgraph_message(m) for m in messages if m.id not in skip_ids]
 
 
-async def filter_only_new_messages(
-    agent: CompiledStateGraph, thread_id: str, input_messages: list[dict]
-) -> list[dict]:
+def _to_langgraph_message(message: Any) -> Dict[str, Any]:
+    m_dict = message.model_dump(exclude=_EXCLUDED_KEYS_BY_ROLE.get(message.role))
+    if message.role == "assistant" and m_dict["content"] is None:
+        m_dict["content"] = ""
+    return m_dict
+
+
+async def _existing_message_ids(agent: CompiledStateGraph, thread_id: str) -> Set[str]:
     config = RunnableConfig({"configurable": {"thread_id": thread_id}})
     state_snapshot = await agent.aget_state(config)
     existing_messages = state_snapshot.values.get("messages", []) or []
@@ -59,6 +66,13 @@ async def filter_only_new_messages(
     for message in existing_messages:
         if message.id:
             existing_ids.add(message.id)
+    return existing_ids
+
+
+async def filter_only_new_messages(
+    agent: CompiledStateGraph, thread_id: str, input_messages: list[dict]
+) -> list[dict]:
+    existing_ids = await _existing_message_ids(agent, thread_id)
 
     # input_messages are your dicts from the client (with "id")
     return [m for m in input_messages if m.get("id") not in existing_ids]
@@ -13,8 +13,8 @@ network is never touched and no aimock recording is required.
 
 Real pyagentspec event/span classes are used (built with ``model_construct`` to
 bypass their heavy required-field validation) because the span processor
-dispatches on event *type* via structured ``match``/``case`` pattern matching --
-duck-typed stand-ins would not match those cases.
+dispatches on event *type* through a table keyed by the pyagentspec event class
+-- duck-typed stand-ins would not be found in it.
 """
 
 import asyncio
@@ -28,8 +28,9 @@ from ag_ui.core import RunAgentInput
 # ---------------------------------------------------------------------------
 # Real pyagentspec tracing event / span builders.
 #
-# The span processor keys off the concrete event class (``case
-# LlmGenerationResponse():`` etc.), so we must hand it genuine instances. Their
+# The span processor keys off the concrete event class (its handler table maps
+# ``LlmGenerationResponse`` etc. to methods), so we must hand it genuine
+# instances. Their
 # constructors require complex ``tool``/``llm_config`` components we do not
 # need for the translation paths under test, so we use ``model_construct`` to
 # stamp out a real-typed instance carrying only the attributes the processor
@@ -0,0 +1,133 @@
+# Copyright © 2025 Oracle and/or its affiliates.
+#
+# This software is under the Apache License 2.0
+# (LICENSE-APACHE or http://www.apache.org/licenses/LICENSE-2.0) or Universal Permissive License
+# (UPL) 1.0 (LICENSE-UPL or https://oss.oracle.com/licenses/upl), at your option.
+"""Behaviour tests for the FastAPI SSE endpoint.
+
+A stub agent pushes pre-built AG-UI events into the per-request queue, so the
+endpoint's batching, sentinel handling and lifecycle re-stamping are exercised
+through a real FastAPI app without touching an agent runtime or LLM.
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ag_ui.core import (
+    CustomEvent,
+    EventType,
+    RunFinishedEvent,
+    RunStartedEvent,
+    TextMessageContentEvent,
+)
+from ag_ui.encoder import EventEncoder
+
+import ag_ui_agentspec.endpoint as endpoint
+from ag_ui_agentspec.agentspec_tracing_exporter import EVENT_QUEUE
+
+
+class _StubAgent:
+    """Agent stand-in whose run() queues a fixed list of items in one go."""
+
+    def __init__(self, items):
+        self._items = items
+
+    async def run(self, input_data):
+        queue = EVENT_QUEUE.get()
+        for item in self._items:
+            queue.put_nowait(item)
+
+
+@pytest.fixture
+def recorded_chunks(monkeypatch):
+    """Record every chunk the endpoint's generator yields to the response."""
+    chunks = []
+
+    class _RecordingResponse(endpoint.StreamingResponse):
+        def __init__(self, content, **kwargs):
+            async def _record():
+                async for chunk in content:
+                    chunks.append(chunk)
+                    yield chunk
+
+            super().__init__(_record(), **kwargs)
+
+    monkeypatch.setattr(endpoint, "StreamingResponse", _RecordingResponse)
+    return chunks
+
+
+def _post(items, make_input):
+    app = FastAPI()
+    endpoint.add_agentspec_fastapi_endpoint(app, _StubAgent(items))
+    body = make_input(thread_id="thread-1", run_id="run-1").model_dump(by_alias=True)
+    with TestClient(app) as client:
+        response = client.post("/", json=body)
+    assert response.status_code == 200
+    return [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def _run_events(*text_deltas):
+    return [
+        RunStartedEvent(thread_id="stale", run_id="stale"),
+        *(TextMessageContentEvent(message_id="m1", delta=d) for d in text_deltas),
+        RunFinishedEvent(thread_id="stale", run_id="stale"),
+    ]
+
+
+def test_queued_burst_is_written_as_one_chunk(make_input, recorded_chunks):
+    events = _post(_run_events("a", "b", "c"), make_input)
+    assert [e["type"] for e in events] == [
+        EventType.RUN_STARTED,
+        EventType.TEXT_MESSAGE_CONTENT,
+        EventType.TEXT_MESSAGE_CONTENT,
+        EventType.TEXT_MESSAGE_CONTENT,
+        EventType.RUN_FINISHED,
+    ]
+    # Everything was queued before the generator woke, so one write carries it.
+    assert len(recorded_chunks) == 1
+
+
+def test_lifecycle_events_restamped_with_request_ids(make_input, recorded_chunks):
+    events = _post(_run_events("a"), make_input)
+    for event in (events[0], events[-1]):
+        assert event["threadId"] == "thread-1"
+        assert event["runId"] == "run-1"
+
+
+def test_sentinel_mid_batch_ends_the_stream(make_input, recorded_chunks):
+    after = TextMessageContentEvent(message_id="m1", delta="after")
+    events = _post([*_run_events("before"), None, after], make_input)
+    deltas = [e["delta"] for e in events if e["type"] == EventType.TEXT_MESSAGE_CONTENT]
+    assert deltas == ["before"]
+    assert events[-1]["type"] == EventType.RUN_FINISHED
+
+
+def test_encode_failure_keeps_frames_already_encoded(make_input, recorded_chunks, monkeypatch):
+    class _FailingEncoder(EventEncoder):
+        def encode(self, event):
+            if event.type == EventType.CUSTOM:
+                raise ValueError("cannot encode")
+            return super().encode(event)
+
+    monkeypatch.setattr(endpoint, "EventEncoder", _FailingEncoder)
+    items = [
+        RunStartedEvent(thread_id="stale", run_id="stale"),
+        TextMessageContentEvent(message_id="m1", delta="kept"),
+        CustomEvent(name="boom", value=None),
+        TextMessageContentEvent(message_id="m1", delta="dropped"),
+    ]
+    events = _post(items, make_input)
+    assert [e["type"] for e in events] == [
+        EventType.RUN_STARTED,
+        EventType.TEXT_MESSAGE_CONTENT,
+        EventType.RUN_ERROR,
+    ]
+    assert events[1]["delta"] == "kept"
+    assert events[-1]["message"] == "cannot encode"
@@ -63,6 +63,16 @@ class TestPrepareLangGraphAgentInputs:
         assert out[0]["role"] == "system"
         assert out[0]["content"] == "be nice"
 
+    def test_skip_ids_are_left_out(self, make_input):
+        inp = make_input(
+            messages=[
+                UserMessage(id="1", role="user", content="old"),
+                UserMessage(id="2", role="user", content="new"),
+            ]
+        )
+        out = prepare_langgraph_agent_inputs(inp, skip_ids={"1"})
+        assert [m["id"] for m in out] == ["2"]
+
 
 class _FakeGraph:
     """Minimal stand-in for a CompiledStateGraph exposing only ``aget_state``."""
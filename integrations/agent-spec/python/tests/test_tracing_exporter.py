@@ -10,10 +10,16 @@ tracing events into AG-UI protocol events. These tests feed it genuine
 pyagentspec events and assert on the AG-UI events it produces.
 """
 
+import asyncio
+import contextvars
 import json
 import logging
 
 import pytest
+from pyagentspec.tracing.events.llmgeneration import (
+    LlmGenerationChunkReceived,
+    LlmGenerationRequest,
+)
 
 from ag_ui.core.events import (
     EventType,
@@ -23,6 +29,7 @@ from ag_ui.core.events import (
 )
 
 from ag_ui_agentspec.agentspec_tracing_exporter import (
+    EVENT_QUEUE,
     AgUiSpanProcessor,
     _escape_html,
     _normalize_tool_output,
@@ -60,6 +67,10 @@ class TestEscapeHtml:
     def test_plain_text_unchanged(self):
         assert _escape_html("hello") == "hello"
 
+    def test_plain_text_returned_without_copying(self):
+        text = "no markup in this delta"
+        assert _escape_html(text) is text
+
 
 class TestJsonable:
     def test_valid_json_string(self):
@@ -98,6 +109,30 @@ class TestNormalizeToolOutput:
     def test_plain_primitive_string(self):
         assert _normalize_tool_output("sunny") == "sunny"
 
+    def test_plain_text_skips_literal_eval(self, monkeypatch):
+        import ag_ui_agentspec.agentspec_tracing_exporter as exporter
+
+        def _fail(_):
+            raise AssertionError("literal_eval should not run on plain text")
+
+        monkeypatch.setattr(exporter.ast, "literal_eval", _fail)
+        assert _normalize_tool_output("It is sunny today.") == "It is sunny today."
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("\n{'a': 1}", {"a": 1}),
+            (".5", 0.5),
+            ("u'hi'", "hi"),
+            ("r'a\\b'", "a\\b"),
+        ],
+    )
+    def test_literal_with_leading_newline_or_prefix_still_parsed(self, text, expected):
+        assert json.loads(_normalize_tool_output(text)) == expected
+
+    def test_python_keyword_string_parsed_to_json(self):
+        assert _normalize_tool_output("True") == "true"
+
 
 class TestRepairA2uiJson:
     def test_dict_passthrough(self):
@@ -146,6 +181,36 @@ class TestRunLifecycle:
         assert started.thread_id == finished.thread_id
         assert started.run_id == finished.run_id
 
+    def test_events_follow_each_context_queue(self):
+        # One processor serves concurrent requests; each request's events must
+        # land in the queue set in that request's context.
+        proc = AgUiSpanProcessor(runtime="wayflow")
+        span = make_span(id="llm-1")
+        queues = []
+        for message_id in ("msg-a", "msg-b"):
+            queue: asyncio.Queue = asyncio.Queue()
+            queues.append(queue)
+            ctx = contextvars.copy_context()
+            ctx.run(EVENT_QUEUE.set, queue)
+            ctx.run(proc.on_event, llm_chunk(content="hi", completion_id=message_id), span)
+        assert [q.get_nowait().message_id for q in queues] == ["msg-a", "msg-b"]
+
+    @pytest.mark.parametrize("maxsize", [0, 8])
+    async def test_async_lifecycle_enqueues_on_any_queue(self, maxsize):
+        # Unbounded queues take the put_nowait path; bounded ones await put().
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        token = EVENT_QUEUE.set(queue)
+        try:
+            proc = AgUiSpanProcessor(runtime="langgraph")
+            await proc.startup_async()
+            await proc.shutdown_async()
+        finally:
+            EVENT_QUEUE.reset(token)
+        assert [queue.get_nowait().type for _ in range(2)] == [
+            EventType.RUN_STARTED,
+            EventType.RUN_FINISHED,
+        ]
+
     def test_emit_without_queue_raises(self):
         # No EVENT_QUEUE set in this (non-fixtured) context.
         proc = AgUiSpanProcessor(runtime="langgraph")
@@ -169,6 +234,19 @@ class TestLlmTextStreaming:
         assert events[0].delta == "hello"
         assert events[0].message_id == "msg-1"
 
+    def test_chunk_serializes_like_validated_event(self):
+        # Chunks are built with model_construct; the wire form must match.
+        proc = AgUiSpanProcessor(runtime="wayflow")
+        span = make_span(id="llm-1")
+        events = proc._gather_events_for_event(
+            llm_chunk(content="hello", completion_id="msg-1"), span
+        )
+        expected = TextMessageChunkEvent(message_id="msg-1", role="assistant", delta="hello")
+        assert events[0].type == EventType.TEXT_MESSAGE_CHUNK
+        assert events[0].model_dump_json(by_alias=True, exclude_none=True) == expected.model_dump_json(
+            by_alias=True, exclude_none=True
+        )
+
     def test_chunk_content_is_html_escaped(self):
         proc = AgUiSpanProcessor(runtime="wayflow")
         span = make_span(id="llm-1")
@@ -247,6 +325,16 @@ class TestToolCallEmission:
         assert tool_events[0].tool_call_name == "get_weather"
         assert json.loads(tool_events[0].delta) == {"city": "SF"}
 
+    def test_response_normalizes_tool_call_arguments(self):
+        proc = AgUiSpanProcessor(runtime="wayflow")
+        span = make_span(id="llm-1")
+        tc = FakeToolCall(call_id="tc-1", tool_name="get_weather", arguments='{ "city":"Zürich" }')
+        events = proc._gather_events_for_event(
+            llm_response(content="", completion_id="msg-1", tool_calls=[tc]), span
+        )
+        # Re-serialized with json.dumps: stock separators, non-ASCII escaped.
+        assert events[0].delta == '{"city": "Z\\u00fcrich"}'
+
     def test_response_repairs_a2ui_json_argument(self):
         proc = AgUiSpanProcessor(runtime="wayflow")
         span = make_span(id="llm-1")
@@ -373,3 +461,30 @@ class TestExceptionRaised:
         span = make_span(id="span-1")
         with pytest.raises(RuntimeError, match="ExceptionRaised occurred"):
             proc._gather_events_for_event(exception_raised(message="kaboom"), span)
+
+
+# ---------------------------------------------------------------------------
+# Event dispatch
+# ---------------------------------------------------------------------------
+
+class TestEventDispatch:
+    def test_llm_request_emits_nothing(self):
+        proc = AgUiSpanProcessor(runtime="wayflow")
+        span = make_span(id="llm-1")
+        assert proc._gather_events_for_event(LlmGenerationRequest.model_construct(), span) == []
+
+    def test_subclass_of_handled_event_is_dispatched(self):
+        class CustomChunk(LlmGenerationChunkReceived):
+            pass
+
+        proc = AgUiSpanProcessor(runtime="wayflow")
+        span = make_span(id="llm-1")
+        for _ in range(2):  # second pass takes the cached lookup
+            events = proc._gather_events_for_event(
+                CustomChunk.model_construct(
+                    content="hi", request_id="req-1", completion_id="msg-1", tool_calls=[]
+                ),
+                span,
+            )
+            assert len(events) == 1
+            assert events[0].delta == "hi"
@@ -0,0 +1,38 @@
+"""Shared fixtures for the AWS Strands integration tests."""
+
+from __future__ import annotations
+
+import pytest
+from strands.models.model import Model
+
+
+class _StubModel(Model):
+    """Concrete, do-nothing Model so Strands' isinstance checks succeed.
+
+    A real subclass is far cheaper to build than ``MagicMock(spec=Model)``
+    and, unlike a MagicMock, does not answer unknown attributes with a
+    truthy child mock. ``stateful`` is pinned to ``False`` so Agent
+    constructor branches that key off statefulness behave as for a plain
+    stateless provider, whichever Strands version is installed. No test
+    streams from the template's model, so the abstract methods are stubs.
+    """
+
+    stateful = False
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    def structured_output(self, *args, **kwargs):
+        raise AssertionError("stub model must not be called")
+
+    def stream(self, *args, **kwargs):
+        raise AssertionError("stub model must not be called")
+
+
+@pytest.fixture(scope="session")
+def stub_model():
+    """One stateless stub Model shared by every template Agent in the suite."""
+    return _StubModel()
@@ -2,9 +2,6 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
-
-import pytest
 from ag_ui.core import Tool as AgUiTool
 from strands.tools.registry import ToolRegistry
 from strands.tools.tools import PythonAgentTool
@@ -6,7 +6,7 @@ Tools running on Strands read it via ``strands_agent.state.get("agui_context")``
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from strands import Agent
@@ -27,12 +27,6 @@ except ImportError:
 from ag_ui_strands.agent import StrandsAgent
 
 
-def _mock_model():
-    m = MagicMock()
-    m.stateful = False
-    return m
-
-
 class _CapturingCore:
     """Stand-in for StrandsAgentCore that records ``state.set`` writes."""
 
@@ -65,8 +59,8 @@ async def _drive_one_event(ag: StrandsAgent, run_input: RunAgentInput) -> _Captu
 
 
 @pytest.mark.asyncio
-async def test_context_forwarded_to_agent_state():
-    template = Agent(model=_mock_model())
+async def test_context_forwarded_to_agent_state(stub_model):
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test")
 
     ctx = [
@@ -85,8 +79,8 @@ async def test_context_forwarded_to_agent_state():
 
 
 @pytest.mark.asyncio
-async def test_empty_context_writes_empty_list():
-    template = Agent(model=_mock_model())
+async def test_empty_context_writes_empty_list(stub_model):
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test")
 
     with patch("ag_ui_strands.agent.StrandsAgentCore", _CapturingCore):
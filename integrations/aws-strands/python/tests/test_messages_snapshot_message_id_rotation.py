@@ -15,7 +15,6 @@ from __future__ import annotations
 
 from unittest.mock import MagicMock
 
-import pytest
 from ag_ui.core import (
     AssistantMessage,
     EventType,
@@ -57,8 +57,11 @@ async def _collect_events(agent: StrandsAgent, input_data: RunAgentInput) -> lis
     return events
 
 
-async def _empty_async_gen():
-    """Async generator that yields nothing, simulating a completed agent stream."""
+async def _empty_async_gen(_prompt):
+    """Async generator that yields nothing, simulating a completed agent stream.
+
+    Takes the prompt so it can stand in for ``stream_async`` directly.
+    """
     return
     yield  # pragma: no cover — makes this an async generator
 
@@ -80,7 +83,7 @@ def _make_mock_instance():
     instance = MagicMock()
     instance.tool_registry = MagicMock()
     instance.tool_registry.registry = {}
-    instance.stream_async = MagicMock(side_effect=lambda _: _empty_async_gen())
+    instance.stream_async = _empty_async_gen
     return instance
 
 
@@ -21,14 +21,11 @@ The streaming refactor emits in this order on the wire:
 
 from __future__ import annotations
 
-import asyncio
 from unittest.mock import MagicMock
 
-import pytest
 from ag_ui.core import (
     EventType,
     RunAgentInput,
-    Tool,
     UserMessage,
 )
 from strands.tools.registry import ToolRegistry
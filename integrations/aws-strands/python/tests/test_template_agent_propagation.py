@@ -20,12 +20,6 @@ from ag_ui_strands.agent import (
 )
 
 
-def _mock_model():
-    m = MagicMock()
-    m.stateful = False
-    return m
-
-
 def _run_input(thread_id: str = "t1"):
     from ag_ui.core import RunAgentInput, UserMessage
 
@@ -82,12 +76,12 @@ def _discover_forwardable_params() -> list[str]:
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("param_name", _discover_forwardable_params())
-async def test_template_param_round_trips(param_name):
+async def test_template_param_round_trips(param_name, stub_model):
     """For each Strands Agent init param, a value set on the template
     must reach the per-thread StrandsAgentCore with the same identity."""
     sentinel = MagicMock(name=f"sentinel-{param_name}")
     try:
-        template = Agent(model=_mock_model(), **{param_name: sentinel})
+        template = Agent(model=stub_model, **{param_name: sentinel})
     except (TypeError, ValueError) as e:
         pytest.skip(f"{param_name}: template rejects sentinel ({e})")
 
@@ -102,20 +96,20 @@ async def test_template_param_round_trips(param_name):
 
 
 @pytest.mark.asyncio
-async def test_excluded_params_never_forwarded():
+async def test_excluded_params_never_forwarded(stub_model):
     """Params in _AGUI_EXPLICIT_PARAMS are handled elsewhere and must never
     appear in the generic _agent_kwargs forwarding path."""
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test")
     for p in _AGUI_EXPLICIT_PARAMS - {"self"}:
         assert p not in ag._agent_kwargs, f"{p} leaked into _agent_kwargs"
 
 
 @pytest.mark.asyncio
-async def test_session_manager_on_template_is_dropped_and_warns(caplog):
+async def test_session_manager_on_template_is_dropped_and_warns(caplog, stub_model):
     """Template-level session_manager is the known footgun: drop it, warn loudly."""
     session_manager = MagicMock(name="session_manager")
-    template = Agent(model=_mock_model(), session_manager=session_manager)
+    template = Agent(model=stub_model, session_manager=session_manager)
 
     with caplog.at_level(logging.WARNING, logger="ag_ui_strands.agent"):
         ag = StrandsAgent(template, name="test")
@@ -165,12 +159,12 @@ def test_extract_agent_kwargs_underscore_fallback():
 
 
 @pytest.mark.asyncio
-async def test_template_session_manager_no_warning_when_provider_set(caplog):
+async def test_template_session_manager_no_warning_when_provider_set(caplog, stub_model):
     """With a provider configured, the warning should NOT fire."""
     from ag_ui_strands.config import StrandsAgentConfig
 
     session_manager = MagicMock(name="session_manager")
-    template = Agent(model=_mock_model(), session_manager=session_manager)
+    template = Agent(model=stub_model, session_manager=session_manager)
     config = StrandsAgentConfig(session_manager_provider=lambda _inp: MagicMock())
 
     with caplog.at_level(logging.WARNING, logger="ag_ui_strands.agent"):
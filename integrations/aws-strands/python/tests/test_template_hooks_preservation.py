@@ -12,40 +12,37 @@ PASS once hooks are forwarded to per-thread instances.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import functools
+from unittest.mock import patch
 
 import pytest
-from ag_ui.core import RunErrorEvent
+from ag_ui.core import RunAgentInput, RunErrorEvent, UserMessage
 from strands import Agent
 from strands.hooks import HookProvider
 from strands.hooks.events import BeforeToolCallEvent
-from strands.models.model import Model
 from strands.tools.registry import ToolRegistry
 
+import ag_ui_strands.agent as agent_module
 from ag_ui_strands.agent import StrandsAgent
 
 
-def _mock_model():
-    """Build a spec'd Model mock so Strands' isinstance checks succeed.
+# Every test here is a coroutine that builds its own StrandsAgent, so they
+# can share one event loop for the module instead of creating and closing a
+# fresh loop per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-    Using ``spec=Model`` ensures the mock reports as a ``Model`` instance,
-    avoiding confusing failures if Strands ever tightens its type checks
-    during Agent construction.
 
-    ``stateful`` is verified present on ``strands.models.model.Model`` as
-    of the installed Strands version (alongside ``get_config``, ``stream``,
-    ``structured_output``, ``update_config``). Setting it to ``False``
-    avoids MagicMock returning a truthy child mock for the attribute and
-    confusing Agent constructor branches that key off statefulness.
-    """
-    m = MagicMock(spec=Model)
-    m.stateful = False
-    return m
+# Thread ids for the multi-thread cases; extend here to cover more threads.
+_THREAD_IDS = ("thread-a", "thread-b", "thread-c")
 
 
+@functools.cache
 def _run_input(thread_id: str = "t1"):
-    from ag_ui.core import RunAgentInput, UserMessage
+    """Build (once per thread_id) the RunAgentInput these tests drive.
 
+    ``StrandsAgent.run()`` only reads its input, so the validated model is
+    shared across tests instead of being rebuilt for every run.
+    """
     return RunAgentInput(
         thread_id=thread_id,
         run_id="r1",
@@ -72,22 +69,34 @@ class _CapturingCore:
             yield
 
 
+def _capturing_core():
+    """Patch ``StrandsAgentCore`` with ``_CapturingCore`` for per-thread construction.
+
+    Deliberately a context manager entered around ``ag.run()`` rather than a
+    fixture: ``StrandsAgent.__init__`` introspects the real
+    ``StrandsAgentCore.__init__`` signature to copy template kwargs, so the
+    patch must not be active while the wrapper itself is constructed.
+    """
+    return patch.object(agent_module, "StrandsAgentCore", _CapturingCore)
+
+
 async def _drive_run(ag: StrandsAgent, thread_id: str):
     """Consume ag.run() events until the per-thread agent exists.
 
-    Returns the list of yielded events so callers can inspect them
-    (e.g. to surface a ``RunErrorEvent`` before asserting the dict key
-    is populated).
+    Returns only the ``RunErrorEvent``s seen along the way, which is all
+    callers inspect (to surface a construction failure before asserting the
+    dict key is populated); other events are dropped as they arrive.
     """
-    events = []
+    run_errors = []
     async for ev in ag.run(_run_input(thread_id)):
-        events.append(ev)
+        if isinstance(ev, RunErrorEvent):
+            run_errors.append(ev)
         # Early-exit as soon as the per-thread agent exists so tests stay
         # fast, but don't assume a specific yield order — if it's missing
         # we keep consuming events until the stream ends.
         if thread_id in ag._agents_by_thread:
             break
-    return events
+    return run_errors
 
 
 async def _trigger_thread_creation(ag: StrandsAgent, thread_id: str):
@@ -102,8 +111,7 @@ async def _trigger_thread_creation(ag: StrandsAgent, thread_id: str):
     "construction order" diagnostic below is misleading and hides the
     real error.
     """
-    events = await _drive_run(ag, thread_id)
-    run_errors = [ev for ev in events if isinstance(ev, RunErrorEvent)]
+    run_errors = await _drive_run(ag, thread_id)
     assert not run_errors, (
         f"ag.run() emitted RunErrorEvent(s) before per-thread agent was "
         f"constructed for thread_id={thread_id!r}: {run_errors!r}. The "
@@ -130,8 +138,7 @@ class _LoggingHooks(HookProvider):
         registry.add_callback(BeforeToolCallEvent, lambda e: None)
 
 
-@pytest.mark.asyncio
-async def test_template_hooks_forwarded_to_per_thread_agent():
+async def test_template_hooks_forwarded_to_per_thread_agent(stub_model):
     """Hook providers passed to StrandsAgent(hooks=...) must be forwarded
     to every per-thread StrandsAgentCore instance.
 
@@ -140,10 +147,10 @@ async def test_template_hooks_forwarded_to_per_thread_agent():
     only per-thread agents serve requests, not the template.
     """
     provider = _LoggingHooks()
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test", hooks=[provider])
 
-    with patch("ag_ui_strands.agent.StrandsAgentCore", _CapturingCore):
+    with _capturing_core():
         instance = await _trigger_thread_creation(ag, "t1")
 
     assert "hooks" in instance.init_kwargs, (
@@ -156,8 +163,7 @@ async def test_template_hooks_forwarded_to_per_thread_agent():
     )
 
 
-@pytest.mark.asyncio
-async def test_each_thread_gets_independent_hook_invocation():
+async def test_each_thread_gets_independent_hook_invocation(stub_model):
     """Each per-thread agent must receive the configured hook providers
     so callbacks fire on every thread, not just the first.
 
@@ -168,19 +174,19 @@ async def test_each_thread_gets_independent_hook_invocation():
     ``register_hooks`` on each thread's registry.
     """
     provider = _LoggingHooks()
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test", hooks=[provider])
 
-    with patch("ag_ui_strands.agent.StrandsAgentCore", _CapturingCore):
-        instance_a = await _trigger_thread_creation(ag, "thread-a")
-        instance_b = await _trigger_thread_creation(ag, "thread-b")
+    with _capturing_core():
+        instances = {
+            thread_id: await _trigger_thread_creation(ag, thread_id)
+            for thread_id in _THREAD_IDS
+        }
 
-    assert provider in instance_a.init_kwargs.get("hooks", []), (
-        "thread-a did not receive the hook provider"
-    )
-    assert provider in instance_b.init_kwargs.get("hooks", []), (
-        "thread-b did not receive the hook provider"
-    )
+    for thread_id, instance in instances.items():
+        assert provider in instance.init_kwargs.get("hooks", []), (
+            f"{thread_id} did not receive the hook provider"
+        )
     # _CapturingCore is a stub and does not itself wire hooks into a
     # HookRegistry, so ``registrations`` stays at 0 here — the real
     # registration counting is exercised in
@@ -194,23 +200,22 @@ async def test_each_thread_gets_independent_hook_invocation():
 # StrandsAgentCore construction — not forwarded as ``None`` / ``[]``,
 # which future Strands versions might interpret as "disable default
 # hooks".
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
     "hooks_value,label",
     [(None, "hooks kwarg omitted (hooks=None default)"),
      ([], "explicit empty list (hooks=[])")],
     ids=["default-none", "explicit-empty-list"],
 )
-async def test_no_hooks_kwarg_is_omitted_for_falsy_input(hooks_value, label):
+async def test_no_hooks_kwarg_is_omitted_for_falsy_input(hooks_value, label, stub_model):
     """When the caller does not supply hook providers (either by omitting
     the kwarg or by passing ``hooks=[]``), the wrapper must omit the
     ``hooks`` kwarg entirely when constructing each per-thread
     StrandsAgentCore."""
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     kwargs = {} if hooks_value is None else {"hooks": hooks_value}
     ag = StrandsAgent(template, name="test", **kwargs)
 
-    with patch("ag_ui_strands.agent.StrandsAgentCore", _CapturingCore):
+    with _capturing_core():
         instance = await _trigger_thread_creation(ag, "t1")
 
     assert "hooks" not in instance.init_kwargs, (
@@ -220,8 +225,7 @@ async def test_no_hooks_kwarg_is_omitted_for_falsy_input(hooks_value, label):
     )
 
 
-@pytest.mark.asyncio
-async def test_hooks_kwarg_forwarded_when_provider_supplied():
+async def test_hooks_kwarg_forwarded_when_provider_supplied(stub_model):
     """Positive-case complement to ``test_no_hooks_kwarg_is_omitted_for_falsy_input``.
 
     When the caller DOES supply at least one ``HookProvider``, the wrapper
@@ -230,10 +234,10 @@ async def test_hooks_kwarg_forwarded_when_provider_supplied():
     truthy-branch flips to "also omit" or mutates the list shape.
     """
     provider = _LoggingHooks()
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test", hooks=[provider])
 
-    with patch("ag_ui_strands.agent.StrandsAgentCore", _CapturingCore):
+    with _capturing_core():
         instance = await _trigger_thread_creation(ag, "t1")
 
     assert "hooks" in instance.init_kwargs, (
@@ -249,8 +253,7 @@ async def test_hooks_kwarg_forwarded_when_provider_supplied():
     )
 
 
-@pytest.mark.asyncio
-async def test_hooks_integration_real_core_fires_callback():
+async def test_hooks_integration_real_core_fires_callback(stub_model):
     """End-to-end-ish check against the real strands.Agent: a callback
     registered via StrandsAgent(hooks=[...]) must actually fire inside
     the per-thread agent's HookRegistry. This is the high-signal repro
@@ -263,7 +266,7 @@ async def test_hooks_integration_real_core_fires_callback():
                 BeforeToolCallEvent, lambda e: fire_count.__setitem__("n", fire_count["n"] + 1)
             )
 
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test", hooks=[_CountingHooks()])
 
     # Trigger per-thread agent creation using the real StrandsAgentCore.
@@ -297,8 +300,7 @@ async def test_hooks_integration_real_core_fires_callback():
     )
 
 
-@pytest.mark.asyncio
-async def test_registrations_fire_per_thread_with_real_core():
+async def test_registrations_fire_per_thread_with_real_core(stub_model):
     """Verifies per-thread ``register_hooks`` invocation against the real
     StrandsAgentCore.
 
@@ -310,19 +312,18 @@ async def test_registrations_fire_per_thread_with_real_core():
     registry".
     """
     provider = _LoggingHooks()
-    template = Agent(model=_mock_model())
+    template = Agent(model=stub_model)
     ag = StrandsAgent(template, name="test", hooks=[provider])
 
     # Real StrandsAgentCore is in play (no patch); each per-thread
     # construction builds a fresh HookRegistry which calls
     # ``provider.register_hooks(registry)`` exactly once.
-    await _trigger_thread_creation(ag, "thread-a")
-    await _trigger_thread_creation(ag, "thread-b")
-    await _trigger_thread_creation(ag, "thread-c")
+    for thread_id in _THREAD_IDS:
+        await _trigger_thread_creation(ag, thread_id)
 
-    assert provider.registrations == 3, (
+    assert provider.registrations == len(_THREAD_IDS), (
         f"expected provider.register_hooks() to be invoked once per "
-        f"per-thread agent (3 threads); got {provider.registrations}. "
+        f"per-thread agent ({len(_THREAD_IDS)} threads); got {provider.registrations}. "
         "Either the hooks kwarg wasn't forwarded, or Strands changed its "
         "HookRegistry construction semantics."
     )
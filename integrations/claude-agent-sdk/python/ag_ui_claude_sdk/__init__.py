@@ -14,15 +14,29 @@ For full documentation on ClaudeAgentOptions, see:
 https://platform.claude.com/docs/en/agent-sdk/python
 """
 
+from importlib import import_module
 from importlib.metadata import version, PackageNotFoundError
+from typing import TYPE_CHECKING
 
-from .adapter import ClaudeAgentAdapter
-from .endpoint import add_claude_fastapi_endpoint
-from .config import (
-    ALLOWED_FORWARDED_PROPS,
-    STATE_MANAGEMENT_TOOL_NAME,
-    AG_UI_MCP_SERVER_NAME,
-)
+if TYPE_CHECKING:
+    from .adapter import ClaudeAgentAdapter
+    from .endpoint import add_claude_fastapi_endpoint
+    from .config import (
+        ALLOWED_FORWARDED_PROPS,
+        STATE_MANAGEMENT_TOOL_NAME,
+        AG_UI_MCP_SERVER_NAME,
+    )
+
+# Public names resolved on first access (PEP 562), so importing the package
+# (or only its config constants) does not pull in the adapter, the Claude
+# Agent SDK or FastAPI.
+_LAZY_ATTRS = {
+    "ClaudeAgentAdapter": ".adapter",
+    "add_claude_fastapi_endpoint": ".endpoint",
+    "ALLOWED_FORWARDED_PROPS": ".config",
+    "STATE_MANAGEMENT_TOOL_NAME": ".config",
+    "AG_UI_MCP_SERVER_NAME": ".config",
+}
 
 try:
     __version__ = version("ag-ui-claude-sdk")
@@ -37,3 +51,15 @@ __all__ = [
     "AG_UI_MCP_SERVER_NAME",
 ]
 
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,7 +6,7 @@ import logging
 import json
 import uuid
 from datetime import datetime
-from typing import AsyncIterator, Optional, List, Dict, Any, Union, TYPE_CHECKING
+from typing import AsyncIterator, Callable, Optional, List, Dict, Any, Union, TYPE_CHECKING
 
 from ag_ui.core import (
     EventType,
@@ -71,6 +71,40 @@ if not logger.handlers:
     logger.setLevel(getattr(logging, os.getenv("LOGLEVEL", "INFO").upper(), logging.INFO))
 
 
+def _dump_dict_options(options: dict) -> Dict[str, Any]:
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _dump_object_options(options: Any) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in options.__dict__.items()
+        if not key.startswith("_") and value is not None
+    }
+
+
+def _resolve_options_dumper(options: Any) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """Pick how ``build_options`` turns the base ``options`` into kwargs.
+
+    Resolved once per adapter so each run skips the Pydantic v2 / v1 /
+    ``__dict__`` probing. Returns None when there is nothing to merge.
+    """
+    if options is None:
+        return None
+    if isinstance(options, dict):
+        return _dump_dict_options
+    # ClaudeAgentOptions object - try Pydantic v2 style first
+    if hasattr(options, "model_dump"):
+        return lambda o: o.model_dump(exclude_none=True)
+    # Fall back to Pydantic v1 style
+    if hasattr(options, "dict"):
+        return lambda o: o.dict(exclude_none=True)
+    # Fall back to __dict__ for plain dataclasses/objects
+    if hasattr(options, "__dict__"):
+        return _dump_object_options
+    return None
+
+
 class ClaudeAgentAdapter:
     """
     AG-UI adapter for the Anthropic Claude Agent SDK.
@@ -91,6 +125,7 @@ class ClaudeAgentAdapter:
         self.name = name
         self.description = description
         self._options = options
+        self._options_dumper = _resolve_options_dumper(options)
         self._max_workers = max_workers
         self._worker_ttl_seconds = worker_ttl_seconds
         self._query_timeout_seconds = query_timeout_seconds
@@ -138,8 +173,9 @@ class ClaudeAgentAdapter:
         if thread_id and thread_id in self._workers:
             await self._workers[thread_id]["worker"].interrupt()
         else:
-            for entry in self._workers.values():
-                await entry["worker"].interrupt()
+            await asyncio.gather(
+                *(entry["worker"].interrupt() for entry in list(self._workers.values()))
+            )
 
     def _drop_thread_results(self, thread_id: str) -> None:
         """Drop every per-run result entry belonging to ``thread_id``.
@@ -152,8 +188,18 @@ class ClaudeAgentAdapter:
 
     async def shutdown(self) -> None:
         """Gracefully stop all session workers. Call on server shutdown."""
-        for entry in list(self._workers.values()):
-            await entry["worker"].stop()
+        # Stops are independent (each may wait up to its own timeout), so run
+        # them concurrently; one failing stop must not strand the others.
+        results = await asyncio.gather(
+            *(entry["worker"].stop() for entry in list(self._workers.values())),
+            return_exceptions=True,
+        )
+        cancelled = None
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                cancelled = result
+            elif isinstance(result, BaseException):
+                logger.warning("Worker shutdown error: %s", result)
         self._workers.clear()
         self._state_locks.clear()
         # ``_run_locks`` is cleared ONLY here, on full adapter shutdown (no run
@@ -161,6 +207,10 @@ class ClaudeAgentAdapter:
         # evicted per-thread — see ``_evict_workers`` for the rationale.
         self._run_locks.clear()
         self._per_run_result.clear()
+        # A cancelled stop is not an ordinary failure: propagate it once the
+        # adapter's bookkeeping has been reset.
+        if cancelled is not None:
+            raise cancelled
 
     def _evict_workers(self) -> None:
         """Evict idle workers by TTL and LRU cap.
@@ -270,6 +320,10 @@ class ClaudeAgentAdapter:
         counted_in = False
 
         try:
+            # Frontend tool names are needed both to grant permissions when a
+            # worker is built and to detect frontend-tool halts while streaming.
+            tool_names = extract_tool_names(input_data.tools) if input_data.tools else []
+
             # Get or create worker for this thread.
             # Guard against a poisoned cache entry: if a previously-cached
             # worker's background task has died (e.g. client.connect() failed),
@@ -323,7 +377,7 @@ class ClaudeAgentAdapter:
                     entry = None
 
             if entry is None:
-                options = self.build_options(input_data, thread_id=thread_id)
+                options = self.build_options(input_data, thread_id=thread_id, tool_names=tool_names)
                 worker = SessionWorker(thread_id, options)
                 await worker.start()
                 # ``active_runs`` is a refcount of in-flight run() invocations
@@ -354,26 +408,30 @@ class ClaudeAgentAdapter:
                     f"Run {run_id[:8]}... is branched from parent run {input_data.parent_run_id[:8]}..."
                 )
             
-            # Emit RUN_STARTED
+            # Emit RUN_STARTED. ``input`` is assembled with model_construct
+            # from already-validated fields (a plain dict would be re-validated
+            # message by message); only the listed fields are echoed, so extra
+            # client keys and ``resume`` stay off the wire.
+            run_input = RunAgentInput.model_construct(
+                thread_id=thread_id,
+                run_id=run_id,
+                parent_run_id=input_data.parent_run_id,
+                messages=input_data.messages,
+                tools=input_data.tools,
+                state=input_data.state,
+                context=input_data.context,
+                forwarded_props=input_data.forwarded_props,
+            )
             yield RunStartedEvent(
                 type=EventType.RUN_STARTED,
                 thread_id=thread_id,
                 run_id=run_id,
                 parent_run_id=input_data.parent_run_id,
-                input={
-                    "thread_id": thread_id,
-                    "run_id": run_id,
-                    "parent_run_id": input_data.parent_run_id,
-                    "messages": input_data.messages,
-                    "tools": input_data.tools,
-                    "state": input_data.state,
-                    "context": input_data.context,
-                    "forwarded_props": input_data.forwarded_props,
-                }
+                input=run_input,
             )
             
             # Extract frontend tool names for halt detection
-            frontend_tool_names = set(extract_tool_names(input_data.tools)) if input_data.tools else set()
+            frontend_tool_names = set(tool_names)
             if frontend_tool_names:
                 logger.debug(f"Frontend tools detected: {frontend_tool_names}")
             
@@ -497,40 +555,29 @@ class ClaudeAgentAdapter:
             # run can proceed. We acquired it unconditionally before this try.
             run_lock.release()
 
-    def build_options(self, input_data: Optional[RunAgentInput] = None, thread_id: Optional[str] = None) -> "ClaudeAgentOptions":
-        """Build ClaudeAgentOptions from base config + RunAgentInput."""
+    def build_options(
+        self,
+        input_data: Optional[RunAgentInput] = None,
+        thread_id: Optional[str] = None,
+        tool_names: Optional[List[str]] = None,
+    ) -> "ClaudeAgentOptions":
+        """Build ClaudeAgentOptions from base config + RunAgentInput.
+
+        ``tool_names`` may carry the already-extracted frontend tool names of
+        ``input_data.tools``; when omitted they are extracted here.
+        """
         from claude_agent_sdk import ClaudeAgentOptions, create_sdk_mcp_server
         
         # Start with sensible defaults
         merged_kwargs: Dict[str, Any] = {
             "include_partial_messages": True,
-            "stderr": lambda data: logger.debug(f"[Claude CLI stderr] {data.rstrip()}"),
+            "stderr": lambda data: logger.debug("[Claude CLI stderr] %s", data.rstrip()),
         }
         
         # Merge in provided options
-        if self._options is not None:
-            if isinstance(self._options, dict):
-                # Dict format - merge directly
-                for key, value in self._options.items():
-                    if value is not None:
-                        merged_kwargs[key] = value
-                           
-            else:
-                # ClaudeAgentOptions object - extract attributes
-                # Try Pydantic v2 style first
-                if hasattr(self._options, "model_dump"):
-                    base_dict = self._options.model_dump(exclude_none=True)
-                    merged_kwargs.update(base_dict)
-                # Fall back to Pydantic v1 style
-                elif hasattr(self._options, "dict"):
-                    base_dict = self._options.dict(exclude_none=True)
-                    merged_kwargs.update(base_dict)
-                # Fall back to __dict__ for plain dataclasses/objects
-                elif hasattr(self._options, "__dict__"):
-                    for key, value in self._options.__dict__.items():
-                        if not key.startswith("_") and value is not None:
-                            merged_kwargs[key] = value
-        logger.debug(f"Merged kwargs: {merged_kwargs}")
+        if self._options_dumper is not None:
+            merged_kwargs.update(self._options_dumper(self._options))
+        logger.debug("Merged kwargs: %s", merged_kwargs)
         
         # Append state and context to the system prompt (not the user message).
         if input_data:
@@ -543,18 +590,25 @@ class ClaudeAgentAdapter:
         # Ensure ag_ui tools are always allowed (frontend tools + state management)
         if input_data and (input_data.state is not None or input_data.tools):
             allowed_tools = merged_kwargs.get("allowed_tools", [])
+            # Set view of allowed_tools + tools_to_add for O(1) membership;
+            # the lists keep the configured order.
+            granted = set(allowed_tools)
             tools_to_add = []
             
             # Add state management tool if state is provided
-            if input_data.state is not None and STATE_MANAGEMENT_TOOL_FULL_NAME not in allowed_tools:
+            if input_data.state is not None and STATE_MANAGEMENT_TOOL_FULL_NAME not in granted:
                 tools_to_add.append(STATE_MANAGEMENT_TOOL_FULL_NAME)
+                granted.add(STATE_MANAGEMENT_TOOL_FULL_NAME)
             
             # Add frontend tools (prefixed with mcp__ag_ui__)
             if input_data.tools:
-                for tool_name in extract_tool_names(input_data.tools):
+                if tool_names is None:
+                    tool_names = extract_tool_names(input_data.tools)
+                for tool_name in tool_names:
                     prefixed_name = f"mcp__ag_ui__{tool_name}"
-                    if prefixed_name not in allowed_tools:
+                    if prefixed_name not in granted:
                         tools_to_add.append(prefixed_name)
+                        granted.add(prefixed_name)
             
             if tools_to_add:
                 merged_kwargs["allowed_tools"] = [*allowed_tools, *tools_to_add]
@@ -562,7 +616,7 @@ class ClaudeAgentAdapter:
         
         # Remove api_key from options kwargs (handled via environment variable)
         merged_kwargs.pop("api_key", None)
-        logger.debug(f"Merged kwargs after pop: {merged_kwargs}")
+        logger.debug("Merged kwargs after pop: %s", merged_kwargs)
         
         # Apply forwarded_props as per-run overrides (before adding dynamic tools)
         if input_data and input_data.forwarded_props:
@@ -609,19 +663,20 @@ class ClaudeAgentAdapter:
                     AG_UI_MCP_SERVER_NAME: ag_ui_server
                 }
                 
-                # Get tool names safely (SdkMcpTool objects don't have __name__)
-                tool_names = []
-                for t in ag_ui_tools:
-                    if hasattr(t, '__name__'):
-                        tool_names.append(t.__name__)
-                    elif hasattr(t, 'name'):
-                        tool_names.append(t.name)
-                    else:
-                        tool_names.append(str(type(t).__name__))
-                
-                logger.debug(
-                    f"Created ag_ui MCP server with {len(ag_ui_tools)} tools: {tool_names}"
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Get tool names safely (SdkMcpTool objects don't have __name__)
+                    server_tool_names = []
+                    for t in ag_ui_tools:
+                        if hasattr(t, '__name__'):
+                            server_tool_names.append(t.__name__)
+                        elif hasattr(t, 'name'):
+                            server_tool_names.append(t.name)
+                        else:
+                            server_tool_names.append(str(type(t).__name__))
+
+                    logger.debug(
+                        f"Created ag_ui MCP server with {len(ag_ui_tools)} tools: {server_tool_names}"
+                    )
         
         
         # Guard against kwargs that are not valid ClaudeAgentOptions fields.
@@ -642,7 +697,7 @@ class ClaudeAgentAdapter:
                 )
                 merged_kwargs.pop(k, None)
 
-        logger.debug(f"Creating ClaudeAgentOptions with merged kwargs: {merged_kwargs}")
+        logger.debug("Creating ClaudeAgentOptions with merged kwargs: %s", merged_kwargs)
         return ClaudeAgentOptions(**merged_kwargs)
 
     async def _stream_claude_sdk(
@@ -665,7 +720,9 @@ class ClaudeAgentAdapter:
         current_tool_call_id: Optional[str] = None
         current_tool_call_name: Optional[str] = None
         current_tool_display_name: Optional[str] = None
-        accumulated_tool_json: str = ""
+        # input_json_delta chunks for the open tool call, joined once when the
+        # block closes (rather than re-concatenating the string per chunk).
+        tool_json_chunks: List[str] = []
         
         # Track which tools we've already emitted START for (to avoid duplicates)
         processed_tool_ids: set = set()
@@ -675,23 +732,21 @@ class ClaudeAgentAdapter:
         
         # ── MESSAGES_SNAPSHOT accumulation ──
         run_messages: List[Any] = []
+        # message id -> position in run_messages, so upserts don't rescan it.
+        run_message_index: Dict[str, int] = {}
         pending_msg: Optional[Dict[str, Any]] = None
         accumulated_signature = ""
 
-        def _get_msg_id(msg):
-            """Extract message ID from either a dict or an object."""
-            if isinstance(msg, dict):
-                return msg.get("id")
-            return getattr(msg, "id", None)
-
         def upsert_message(msg):
-            """Upsert a message: replace if same ID exists, otherwise append."""
-            msg_id = _get_msg_id(msg)
-            if msg_id is not None:
-                for i, m in enumerate(run_messages):
-                    if _get_msg_id(m) == msg_id:
-                        run_messages[i] = msg
-                        return
+            """Upsert a message: replace if same ID exists, otherwise append.
+
+            Only AG-UI message models are upserted, so ``msg.id`` is always set.
+            """
+            index = run_message_index.get(msg.id)
+            if index is not None:
+                run_messages[index] = msg
+                return
+            run_message_index[msg.id] = len(run_messages)
             run_messages.append(msg)
 
         def flush_pending_msg():
@@ -699,16 +754,16 @@ class ClaudeAgentAdapter:
             nonlocal pending_msg
             if pending_msg is None:
                 return
-            # Use explicit `is not None` checks — empty string "" is falsy but
-            # a message with empty content and non-empty tool_calls is valid.
-            has_content = pending_msg.get("content") is not None and pending_msg["content"] != ""
+            # Text deltas are collected as parts and joined once here; a
+            # message with empty content and non-empty tool_calls is valid.
+            content = "".join(pending_msg["content_parts"])
             has_tools = bool(pending_msg.get("tool_calls"))
-            if has_content or has_tools:
+            if content or has_tools:
                 upsert_message(
-                    AguiAssistantMessage(
+                    AguiAssistantMessage.model_construct(
                         id=pending_msg["id"],
                         role="assistant",
-                        content=pending_msg["content"] if has_content else None,
+                        content=content or None,
                         tool_calls=pending_msg["tool_calls"] if has_tools else None,
                     )
                 )
@@ -738,7 +793,10 @@ class ClaudeAgentAdapter:
             
             logger.debug(f"[Message #{message_count}]: {type(message).__name__}")
             
-            # Handle StreamEvent for real-time streaming chunks
+            # Handle StreamEvent for real-time streaming chunks. These arrive
+            # at token rate, so their events are built with model_construct():
+            # every field comes from the SDK stream or our own ids, and the
+            # encoder serializes them identically to validated instances.
             if isinstance(message, StreamEvent):
                 event_data = message.event
                 event_type = event_data.get('type')
@@ -746,7 +804,7 @@ class ClaudeAgentAdapter:
                 if event_type == 'message_start':
                     current_message_id = str(uuid.uuid4())
                     has_streamed_text = False
-                    pending_msg = {"id": current_message_id, "content": "", "tool_calls": []}
+                    pending_msg = {"id": current_message_id, "content_parts": [], "tool_calls": []}
                 
                 elif event_type == 'content_block_delta':
                     delta_data = event_data.get('delta', {})
@@ -756,7 +814,7 @@ class ClaudeAgentAdapter:
                         text_chunk = fix_surrogates(delta_data.get('text', ''))
                         if text_chunk and current_message_id:
                             if not has_streamed_text:
-                                yield TextMessageStartEvent(
+                                yield TextMessageStartEvent.model_construct(
                                     type=EventType.TEXT_MESSAGE_START,
                                     thread_id=thread_id,
                                     run_id=run_id,
@@ -765,9 +823,9 @@ class ClaudeAgentAdapter:
                                 )
                             has_streamed_text = True
                             if pending_msg is not None:
-                                pending_msg["content"] += text_chunk
+                                pending_msg["content_parts"].append(text_chunk)
 
-                            yield TextMessageContentEvent(
+                            yield TextMessageContentEvent.model_construct(
                                 type=EventType.TEXT_MESSAGE_CONTENT,
                                 thread_id=thread_id,
                                 run_id=run_id,
@@ -777,7 +835,7 @@ class ClaudeAgentAdapter:
                     elif delta_type == 'thinking_delta':
                         thinking_chunk = delta_data.get('thinking', '')
                         if thinking_chunk and reasoning_message_id:
-                            yield ReasoningMessageContentEvent(
+                            yield ReasoningMessageContentEvent.model_construct(
                                 type=EventType.REASONING_MESSAGE_CONTENT,
                                 message_id=reasoning_message_id,
                                 delta=thinking_chunk,
@@ -789,15 +847,15 @@ class ClaudeAgentAdapter:
                     elif delta_type == 'input_json_delta':
                         partial_json = delta_data.get('partial_json', '')
                         if partial_json and current_tool_call_id:
-                            accumulated_tool_json += partial_json
+                            tool_json_chunks.append(partial_json)
                             # Fix surrogates before Pydantic serialization.
                             # JS String.slice() splits emoji into surrogate
                             # pairs across chunks. Lone surrogates in a
                             # single chunk can't be reassembled, so replace
                             # them — the full JSON is fixed later via
-                            # fix_surrogates() on accumulated_tool_json.
+                            # fix_surrogates() on the joined arguments.
                             safe_delta = fix_surrogates(partial_json)
-                            yield ToolCallArgsEvent(
+                            yield ToolCallArgsEvent.model_construct(
                                 type=EventType.TOOL_CALL_ARGS,
                                 thread_id=thread_id,
                                 run_id=run_id,
@@ -824,13 +882,13 @@ class ClaudeAgentAdapter:
                     elif block_type == 'tool_use':
                         current_tool_call_id = block_data.get('id')
                         current_tool_call_name = block_data.get('name', 'unknown')
-                        accumulated_tool_json = ""
+                        tool_json_chunks = []
                         
                         if current_tool_call_id:
                             current_tool_display_name = strip_mcp_prefix(current_tool_call_name)
                             processed_tool_ids.add(current_tool_call_id)
                             
-                            yield ToolCallStartEvent(
+                            yield ToolCallStartEvent.model_construct(
                                 type=EventType.TOOL_CALL_START,
                                 thread_id=thread_id,
                                 run_id=run_id,
@@ -876,6 +934,7 @@ class ClaudeAgentAdapter:
                     
                     # Close tool call if we were streaming one
                     if current_tool_call_id:
+                        accumulated_tool_json = "".join(tool_json_chunks)
                         # Check if this is the state management tool
                         if _is_state_management_tool(current_tool_call_name):
                             try:
@@ -917,7 +976,9 @@ class ClaudeAgentAdapter:
                                     value={"error": str(e)},
                                 )
 
-                        # Push tool call onto in-flight message (skip state management)
+                        # Push tool call onto in-flight message (skip state management).
+                        # Built unvalidated, like the streaming events: every
+                        # field is a str we assembled from the stream above.
                         if (
                             pending_msg is not None
                             and current_tool_call_id
@@ -925,10 +986,10 @@ class ClaudeAgentAdapter:
                             and not _is_state_management_tool(current_tool_call_name)
                         ):
                             pending_msg["tool_calls"].append(
-                                AguiToolCall(
+                                AguiToolCall.model_construct(
                                     id=current_tool_call_id,
                                     type="function",
-                                    function=AguiFunctionCall(
+                                    function=AguiFunctionCall.model_construct(
                                         name=current_tool_display_name,
                                         arguments=accumulated_tool_json,
                                     ),
@@ -941,7 +1002,7 @@ class ClaudeAgentAdapter:
                         if is_frontend_tool:
                             flush_pending_msg()
 
-                            yield ToolCallEndEvent(
+                            yield ToolCallEndEvent.model_construct(
                                 type=EventType.TOOL_CALL_END,
                                 thread_id=thread_id,
                                 run_id=run_id,
@@ -949,7 +1010,7 @@ class ClaudeAgentAdapter:
                             )
                             
                             if current_message_id and has_streamed_text:
-                                yield TextMessageEndEvent(
+                                yield TextMessageEndEvent.model_construct(
                                     type=EventType.TEXT_MESSAGE_END,
                                     thread_id=thread_id,
                                     run_id=run_id,
@@ -961,12 +1022,12 @@ class ClaudeAgentAdapter:
                             current_tool_call_id = None
                             current_tool_call_name = None
                             current_tool_display_name = None
-                            accumulated_tool_json = ""
+                            tool_json_chunks = []
                             halt_event_stream = True
                             continue
                         
                         # Emit TOOL_CALL_END for regular backend tools
-                        yield ToolCallEndEvent(
+                        yield ToolCallEndEvent.model_construct(
                             type=EventType.TOOL_CALL_END,
                             thread_id=thread_id,
                             run_id=run_id,
@@ -977,13 +1038,13 @@ class ClaudeAgentAdapter:
                         current_tool_call_id = None
                         current_tool_call_name = None
                         current_tool_display_name = None
-                        accumulated_tool_json = ""
+                        tool_json_chunks = []
                 
                 elif event_type == 'message_stop':
                     flush_pending_msg()
 
                     if current_message_id and has_streamed_text:
-                        yield TextMessageEndEvent(
+                        yield TextMessageEndEvent.model_construct(
                             type=EventType.TEXT_MESSAGE_END,
                             thread_id=thread_id,
                             run_id=run_id,
@@ -1146,7 +1207,7 @@ class ClaudeAgentAdapter:
 
         run_result = self._per_run_result.get((thread_id, run_id), {}) or {}
         if run_result.get("is_error") and unstreamed_fallback_ids:
-            run_messages[:] = [m for m in run_messages if _get_msg_id(m) not in unstreamed_fallback_ids]
+            run_messages[:] = [m for m in run_messages if m.id not in unstreamed_fallback_ids]
 
         # Emit MESSAGES_SNAPSHOT with input messages + new messages from this run
         if run_messages:
@@ -4,6 +4,7 @@ Utility functions for Claude Agent SDK adapter.
 Helper functions for message processing, tool conversion, and prompt building.
 """
 
+import functools
 import json
 import logging
 from typing import Any, Dict, List, Optional, Tuple
@@ -26,6 +27,10 @@ def fix_surrogates(s: str) -> str:
 
     Round-tripping through UTF-16 reassembles the pairs.
     """
+    # ASCII text cannot contain surrogates; skip the two-way re-encode for the
+    # common case (every streamed text/JSON delta goes through here).
+    if s.isascii():
+        return s
     try:
         return s.encode("utf-16", "surrogatepass").decode("utf-16")
     except (UnicodeDecodeError, UnicodeEncodeError):
@@ -64,6 +69,7 @@ def extract_tool_names(tools: List[Any]) -> List[str]:
     return names
 
 
+@functools.lru_cache(maxsize=256)
 def strip_mcp_prefix(tool_name: str) -> str:
     """
     Strip mcp__servername__ prefix from Claude SDK tool names.
@@ -83,9 +89,9 @@ def strip_mcp_prefix(tool_name: str) -> str:
         "local_tool" -> "local_tool" (unchanged)
     """
     if tool_name.startswith("mcp__"):
-        parts = tool_name.split("__")
-        if len(parts) >= 3:  # mcp__servername__toolname
-            return "__".join(parts[2:])  # Keep just toolname (handles double underscores in names)
+        parts = tool_name.split("__", 2)
+        if len(parts) == 3:  # mcp__servername__toolname
+            return parts[2]  # Keep just toolname (handles double underscores in names)
     return tool_name
 
 
@@ -12,7 +12,8 @@ import json
 
 import pytest
 
-from ag_ui.core import EventType
+from ag_ui.core import EventType, RunAgentInput, RunStartedEvent
+from ag_ui.encoder import EventEncoder
 from ag_ui_claude_sdk.adapter import ClaudeAgentAdapter
 from ag_ui_claude_sdk.config import STATE_MANAGEMENT_TOOL_FULL_NAME, AG_UI_MCP_SERVER_NAME
 
@@ -64,6 +65,37 @@ class TestStreamTextMessage:
         # START precedes content precedes END
         assert types.index(EventType.TEXT_MESSAGE_START) < types.index(EventType.TEXT_MESSAGE_END)
 
+    @pytest.mark.asyncio
+    async def test_streamed_events_encode_like_validated_events(self, make_input):
+        # Streaming events and the snapshot's streamed messages skip
+        # validation; their wire form must not change.
+        adapter = ClaudeAgentAdapter(name="t")
+        stream = [
+            stream_event({"type": "message_start"}),
+            stream_event(
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}
+            ),
+            stream_event(
+                {
+                    "type": "content_block_start",
+                    "content_block": {"type": "tool_use", "id": "tc1", "name": "mcp__srv__lookup"},
+                }
+            ),
+            stream_event(
+                {
+                    "type": "content_block_delta",
+                    "delta": {"type": "input_json_delta", "partial_json": '{"q":"x"}'},
+                }
+            ),
+            stream_event({"type": "content_block_stop"}),
+            stream_event({"type": "message_stop"}),
+        ]
+        events = await _drive(adapter, stream, make_input)
+        encoder = EventEncoder()
+        for event in events:
+            validated = type(event).model_validate(event.model_dump())
+            assert encoder.encode(event) == encoder.encode(validated)
+
     @pytest.mark.asyncio
     async def test_messages_snapshot_emitted_at_end(self, make_input):
         adapter = ClaudeAgentAdapter(name="t")
@@ -79,6 +111,32 @@ class TestStreamTextMessage:
         assert len(snapshots) == 1
         assert any(getattr(m, "content", None) == "Hi" for m in snapshots[0].messages)
 
+    @pytest.mark.asyncio
+    async def test_same_id_upsert_replaces_in_place(self, make_input):
+        # The complete AssistantMessage arrives mid-stream under the streamed
+        # message's id; the flush at message_stop must replace that entry,
+        # keeping its position, rather than append a second one.
+        from claude_agent_sdk.types import TextBlock
+
+        adapter = ClaudeAgentAdapter(name="t")
+        stream = [
+            stream_event({"type": "message_start"}),
+            stream_event(
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}
+            ),
+            AssistantMessage(content=[TextBlock(text="Hi")], model="claude-x"),
+            stream_event({"type": "message_stop"}),
+            stream_event({"type": "message_start"}),
+            stream_event(
+                {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Bye"}}
+            ),
+            stream_event({"type": "message_stop"}),
+        ]
+        events = await _drive(adapter, stream, make_input)
+        snapshot = next(e for e in events if e.type == EventType.MESSAGES_SNAPSHOT)
+        assistant = [m for m in snapshot.messages if getattr(m, "role", None) == "assistant"]
+        assert [m.content for m in assistant] == ["Hi", "Bye"]
+
 
 class TestResultMessageErrorHandling:
     """Regression tests for ag-ui-protocol/ag-ui#2145.
@@ -288,6 +346,42 @@ class TestStreamToolCall:
         # exactly one END for the one tool call
         assert types.count(EventType.TOOL_CALL_END) == 1
 
+    @pytest.mark.asyncio
+    async def test_split_tool_json_is_joined_in_snapshot(self, make_input):
+        adapter = ClaudeAgentAdapter(name="t")
+        chunks = ['{"q"', ':"x', 'yz"', "}"]
+        stream = [
+            stream_event({"type": "message_start"}),
+            stream_event(
+                {
+                    "type": "content_block_start",
+                    "content_block": {"type": "tool_use", "id": "tc1", "name": "mcp__srv__lookup"},
+                }
+            ),
+            *[
+                stream_event(
+                    {
+                        "type": "content_block_delta",
+                        "delta": {"type": "input_json_delta", "partial_json": chunk},
+                    }
+                )
+                for chunk in chunks
+            ],
+            stream_event({"type": "content_block_stop"}),
+            stream_event({"type": "message_stop"}),
+        ]
+        events = await _drive(adapter, stream, make_input)
+        args = [e.delta for e in events if e.type == EventType.TOOL_CALL_ARGS]
+        assert args == chunks
+        snapshot = next(e for e in events if e.type == EventType.MESSAGES_SNAPSHOT)
+        tool_calls = [
+            tc
+            for m in snapshot.messages
+            for tc in (getattr(m, "tool_calls", None) or [])
+        ]
+        assert len(tool_calls) == 1
+        assert json.loads(tool_calls[0].function.arguments) == {"q": "xyz"}
+
     @pytest.mark.asyncio
     async def test_subagent_tool_call_gets_parent_message_id(self, make_input):
         # A complete AssistantMessage, not a StreamEvent, is how a subagent's
@@ -492,6 +586,16 @@ class TestBuildOptions:
         # include_partial_messages default applied
         assert opts.include_partial_messages is True
 
+    def test_options_object_merged(self):
+        from claude_agent_sdk import ClaudeAgentOptions
+
+        adapter = ClaudeAgentAdapter(
+            name="t", options=ClaudeAgentOptions(model="claude-x", max_turns=2)
+        )
+        opts = adapter.build_options()
+        assert opts.model == "claude-x"
+        assert opts.max_turns == 2
+
     def test_api_key_stripped(self):
         # api_key must be popped from the merged kwargs before constructing
         # ClaudeAgentOptions (it is handled via env var, and the options
@@ -520,6 +624,32 @@ class TestBuildOptions:
         assert opts.system_prompt.startswith("BASE")
         assert "Current Shared State" in opts.system_prompt
 
+    def test_frontend_tools_granted_with_and_without_precomputed_names(self, make_input):
+        adapter = ClaudeAgentAdapter(name="t")
+        inp = make_input(tools=[{"name": "confirm", "description": "", "parameters": {}}])
+        expected = f"mcp__{AG_UI_MCP_SERVER_NAME}__confirm"
+        assert expected in adapter.build_options(inp).allowed_tools
+        opts = adapter.build_options(inp, tool_names=extract_tool_names(inp.tools))
+        assert expected in opts.allowed_tools
+
+    def test_allowed_tools_keep_order_without_duplicates(self, make_input):
+        prefix = f"mcp__{AG_UI_MCP_SERVER_NAME}__"
+        adapter = ClaudeAgentAdapter(
+            name="t", options={"allowed_tools": ["Read", f"{prefix}confirm"]}
+        )
+        tool = {"description": "", "parameters": {}}
+        inp = make_input(
+            state={"count": 1},
+            tools=[{**tool, "name": "confirm"}, {**tool, "name": "pick"}, {**tool, "name": "pick"}],
+        )
+        opts = adapter.build_options(inp)
+        assert opts.allowed_tools == [
+            "Read",
+            f"{prefix}confirm",
+            STATE_MANAGEMENT_TOOL_FULL_NAME,
+            f"{prefix}pick",
+        ]
+
     # ── Item 6: forwarded prop that isn't a valid ClaudeAgentOptions kwarg ──
     def test_forwarded_prop_invalid_kwarg_does_not_crash(self, make_input):
         # `temperature` is whitelisted in ALLOWED_FORWARDED_PROPS but is NOT a
@@ -575,6 +705,60 @@ class TestRunErrorPath:
         err = next(e for e in events if e.type == EventType.RUN_ERROR)
         assert "boom" in err.message
 
+    @pytest.mark.asyncio
+    async def test_run_started_input_carries_generated_ids(self, make_input, monkeypatch):
+        adapter = ClaudeAgentAdapter(name="t")
+        monkeypatch.setattr("ag_ui_claude_sdk.adapter.SessionWorker", _FakeFailingWorker)
+
+        inp = make_input(thread_id="", messages=[{"id": "1", "role": "user", "content": "hi"}])
+        events = [e async for e in adapter.run(inp)]
+        started = events[0]
+        assert started.type == EventType.RUN_STARTED
+        assert started.thread_id
+        assert started.input.thread_id == started.thread_id
+        assert started.input.run_id == started.run_id == "run-1"
+        assert started.input.messages == inp.messages
+        # The caller's input object is left untouched.
+        assert inp.thread_id == ""
+
+    @pytest.mark.asyncio
+    async def test_run_started_input_omits_extra_keys_and_resume(self, monkeypatch):
+        adapter = ClaudeAgentAdapter(name="t")
+        monkeypatch.setattr("ag_ui_claude_sdk.adapter.SessionWorker", _FakeFailingWorker)
+
+        inp = RunAgentInput.model_validate({
+            "threadId": "thread-1",
+            "runId": "run-1",
+            "messages": [{"id": "1", "role": "user", "content": "hi"}],
+            "tools": [],
+            "state": {"x": 1},
+            "context": [],
+            "forwardedProps": {},
+            "resume": [{"interruptId": "i-1", "status": "resolved"}],
+            "secretExtra": "x",
+        })
+        events = [e async for e in adapter.run(inp)]
+        # The wire format the dict-built RUN_STARTED produced.
+        expected = RunStartedEvent(
+            thread_id="thread-1",
+            run_id="run-1",
+            input={
+                "thread_id": "thread-1",
+                "run_id": "run-1",
+                "parent_run_id": None,
+                "messages": inp.messages,
+                "tools": inp.tools,
+                "state": inp.state,
+                "context": inp.context,
+                "forwarded_props": inp.forwarded_props,
+            },
+        )
+        encoder = EventEncoder()
+        encoded = encoder.encode(events[0])
+        assert encoded == encoder.encode(expected)
+        assert "secretExtra" not in encoded
+        assert "resume" not in encoded
+
     @pytest.mark.asyncio
     async def test_error_path_cleans_all_three_dicts(self, make_input, monkeypatch):
         # The run() error path must evict the worker AND drop per-thread state
@@ -735,6 +919,42 @@ class TestWorkerLifecycle:
         # Completed tasks are dropped from the retention set.
         assert len(adapter._pending_tasks) == 0
 
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_every_worker_despite_a_failing_stop(self):
+        from datetime import datetime
+
+        class _FailingStopWorker:
+            async def stop(self):
+                raise RuntimeError("stop failed")
+
+        adapter = ClaudeAgentAdapter(name="t")
+        healthy = [_FakeSlowStopWorker(), _FakeSlowStopWorker()]
+        for tid, worker in zip(["a", "b", "c"], [healthy[0], _FailingStopWorker(), healthy[1]]):
+            adapter._workers[tid] = {"worker": worker, "last_used": datetime.now(), "active": False}
+
+        await adapter.shutdown()
+        assert all(w.stopped for w in healthy)
+        assert adapter._workers == {}
+
+    @pytest.mark.asyncio
+    async def test_shutdown_reraises_cancelled_stop_after_cleanup(self):
+        import asyncio
+        from datetime import datetime
+
+        class _CancelledStopWorker:
+            async def stop(self):
+                raise asyncio.CancelledError()
+
+        adapter = ClaudeAgentAdapter(name="t")
+        healthy = _FakeSlowStopWorker()
+        for tid, worker in [("a", healthy), ("b", _CancelledStopWorker())]:
+            adapter._workers[tid] = {"worker": worker, "last_used": datetime.now(), "active": False}
+
+        with pytest.raises(asyncio.CancelledError):
+            await adapter.shutdown()
+        assert healthy.stopped is True
+        assert adapter._workers == {}
+
     # ── Run-admission serialization (Fix 1): two same-thread runs no longer run
     # concurrently — the run-lock serializes them, so the refcount never exceeds
     # 1. The active_runs refcount machinery is retained purely as
@@ -69,6 +69,13 @@ class TestFixSurrogates:
     def test_plain_text_unchanged(self):
         assert fix_surrogates("hello world") == "hello world"
 
+    def test_ascii_text_returned_without_copying(self):
+        text = '{"state_updates": {"count": 1}}'
+        assert fix_surrogates(text) is text
+
+    def test_non_ascii_text_without_surrogates_unchanged(self):
+        assert fix_surrogates("café 🍝") == "café 🍝"
+
     def test_reassembles_surrogate_pair(self):
         # U+1F35D (🍝) as a *split* UTF-16 surrogate pair: a high surrogate
         # (U+D83C) followed by a low surrogate (U+DF5D). This is the genuinely